@@ -0,0 +1,212 @@
+"""Local stand-in for the GitHub and GitLab endpoints used by the runner.
+
+The server answers the GraphQL queries, REST calls, raw-file downloads and
+archive downloads of ``runner`` for repositories whose files live in a local
+directory, so that validation can be timed without network access or tokens.
+Point the runner at it through ``GITHUB_API_URL``, ``GITHUB_RAW_URL`` and
+``GITLAB_URL``.
+"""
+
+import io
+import json
+import re
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote, urlparse
+
+
+STANDARD_TEXT = "# standard-GEM\n\n- [x] model/\n- [ ] README.md\n"
+COMMIT_DATE = "2024-01-01T00:00:00Z"
+
+
+class FakeProviders:
+    """Repositories served by the stand-in, keyed by ``owner/name`` path.
+
+    Each repository maps to the directory holding its ``model/`` files and to
+    its release tags; every ref of a repository serves the same files.
+    """
+
+    def __init__(self, standard_releases=("0.9",)):
+        self.repositories = {}
+        self.standard_releases = list(standard_releases)
+        self.requests = 0
+        self.activity = {}
+
+    def add(self, name_with_owner, model_dir, tags=("v1.0.0",), activity=COMMIT_DATE):
+        self.repositories[name_with_owner] = (Path(model_dir), list(tags))
+        self.activity[name_with_owner] = activity
+
+    def file(self, name_with_owner, path):
+        """Return the bytes of *path* in a repository, or ``None``."""
+
+        if name_with_owner == "MetabolicAtlas/standard-GEM" and path == ".standard-GEM.md":
+            return STANDARD_TEXT.encode()
+        if name_with_owner not in self.repositories:
+            return None
+        if path == ".standard-GEM.md":
+            return STANDARD_TEXT.encode()
+        model_dir, _ = self.repositories[name_with_owner]
+        if path.startswith("model/") and (model_dir / path[len("model/"):]).is_file():
+            return (model_dir / path[len("model/"):]).read_bytes()
+        return None
+
+    def archive(self, name_with_owner):
+        """Return a gzipped tarball of a repository."""
+
+        model_dir, _ = self.repositories[name_with_owner]
+        buffer = io.BytesIO()
+        root = name_with_owner.replace("/", "-") + "-0000000"
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path in sorted(model_dir.iterdir()):
+                archive.add(path, arcname=f"{root}/model/{path.name}")
+            info = tarfile.TarInfo(f"{root}/.standard-GEM.md")
+            info.size = len(STANDARD_TEXT)
+            archive.addfile(info, io.BytesIO(STANDARD_TEXT.encode()))
+        return buffer.getvalue()
+
+    def tags(self, name_with_owner):
+        if name_with_owner == "MetabolicAtlas/standard-GEM":
+            return self.standard_releases
+        return self.repositories.get(name_with_owner, (None, []))[1]
+
+    def github_repository(self, name_with_owner):
+        owner = name_with_owner.split("/")[0]
+        return {
+            "nameWithOwner": name_with_owner,
+            "owner": {"login": owner, "avatarUrl": None, "name": owner},
+            "defaultBranchRef": {
+                "target": {"committedDate": COMMIT_DATE, "history": {"totalCount": 42}}
+            },
+            "releases": {
+                "edges": [
+                    {"node": {"tagName": tag, "createdAt": f"2024-01-{day + 1:02d}T00:00:00Z"}}
+                    for day, tag in enumerate(self.tags(name_with_owner))
+                ]
+            },
+        }
+
+    def gitlab_project(self, full_path):
+        return {
+            "fullPath": full_path,
+            "releases": {
+                "edges": [
+                    {"node": {"tagName": tag, "releasedAt": f"2024-01-{day + 1:02d}T00:00:00Z"}}
+                    for day, tag in enumerate(self.tags(full_path))
+                ]
+            },
+        }
+
+    def page(self, query):
+        """Return the repositories of the page a search query asks for and its info."""
+
+        first = int(re.search(r"first:\s*(\d+)", query).group(1))
+        after = re.search(r'after:\s*"(\d+)"', query)
+        start = int(after.group(1)) if after else 0
+        names = list(self.repositories)[start:start + first]
+        end = start + len(names)
+        return names, {"hasNextPage": end < len(self.repositories), "endCursor": str(end)}
+
+    def github_graphql(self, query):
+        if "search(" in query:
+            names, page_info = self.page(query)
+            repos = [
+                {"repo": {"nameWithOwner": name, "pushedAt": self.activity[name]}}
+                for name in names
+            ]
+            return {"search": {"repos": repos, "pageInfo": page_info}}
+        data = {}
+        pattern = r'(?:(\w+)\s*:\s*)?repository\(\s*owner:\s*"([^"]+)",\s*name:\s*"([^"]+)"'
+        for alias, owner, name in re.findall(pattern, query):
+            data[alias or "repository"] = self.github_repository(f"{owner}/{name}")
+        return data
+
+    def gitlab_graphql(self, query):
+        match = re.search(r"projects\(fullPaths:\s*(\[[^\]]*\])", query)
+        if match:
+            paths = json.loads(match.group(1))
+            nodes = [self.gitlab_project(path) for path in paths if path in self.repositories]
+            return {"projects": {"nodes": nodes}}
+        match = re.search(r'project\(fullPath:\s*"([^"]+)"', query)
+        if match:
+            return {"project": self.gitlab_project(match.group(1))}
+        names, page_info = self.page(query)
+        nodes = [
+            {"node": {"fullPath": name, "lastActivityAt": self.activity[name]}}
+            for name in names
+        ]
+        return {"projects": {"edges": nodes, "pageInfo": page_info}}
+
+
+def _handler(providers):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=None):
+            if isinstance(body, (dict, list)):
+                body = json.dumps(body).encode()
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            providers.requests += 1
+            length = int(self.headers.get("Content-Length", 0))
+            query = json.loads(self.rfile.read(length))["query"]
+            if self.path == "/graphql":
+                self._send(200, {"data": providers.github_graphql(query)})
+            elif self.path == "/api/graphql":
+                self._send(200, {"data": providers.gitlab_graphql(query)})
+            else:
+                self._send(404)
+
+        def do_GET(self):
+            providers.requests += 1
+            path = urlparse(self.path).path
+            rest = re.match(r"/repos/(.+)/contributors$", path)
+            if rest:
+                return self._send(200, [{"login": "someone"}])
+            rest = re.match(r"/repos/([^/]+/[^/]+)/tarball/.+$", path)
+            if rest:
+                return self._send(200, providers.archive(rest.group(1)))
+            rest = re.match(r"/api/v4/projects/([^/]+)(/.*)?$", path)
+            if rest:
+                full_path = unquote(rest.group(1))
+                if rest.group(2) is None:
+                    return self._send(200, {
+                        "id": quote(full_path, safe=""),
+                        "namespace": {"full_path": full_path.rsplit("/", 1)[0]},
+                    })
+                if rest.group(2).endswith("/commits"):
+                    return self._send(200, [{"committed_date": COMMIT_DATE}], {"X-Total": "42"})
+                if rest.group(2).endswith("/contributors"):
+                    return self._send(200, [{"name": "someone"}])
+                if rest.group(2).startswith("/repository/archive"):
+                    return self._send(200, providers.archive(full_path))
+                return self._send(404)
+            # GitLab raw files are below "/-/raw/<ref>/", GitHub's below "/<ref>/"
+            rest = re.match(r"/(.+)/-/raw/[^/]+/(.+)$", path) or re.match(
+                r"/([^/]+/[^/]+)/[^/]+/(.+)$", path
+            )
+            if rest:
+                content = providers.file(rest.group(1), rest.group(2))
+                if content is not None:
+                    return self._send(200, content, {"ETag": f'"{hash(content)}"'})
+            self._send(404)
+
+    return Handler
+
+
+def serve(providers):
+    """Start the stand-in on a free local port and return its server and URL."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(providers))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -0,0 +1,332 @@
+"""Time the validation pipeline on synthetic models served by a local stand-in.
+
+Run from the repository root::
+
+    python -m benchmarks.run --sizes 1000 5000 20000 --output benchmark-results.json
+
+For every model size the benchmark times a whole :func:`runner.validate` with
+an empty and with a warm download cache, :func:`runner.model_metrics` in each
+mode, the MAT-file header inspection of :mod:`matfile` against loading the
+file, and every test end to end on a fresh :class:`runner.ModelContext`, so
+that the model loading a test needs is part of its time. The cold-start time
+of importing the runner in a fresh interpreter is measured once, and so are
+the size and parse time of the result files against the compact exports of
+``summary.py``. Results are written as JSON together with the Python, package
+and git versions they were measured with.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+
+from benchmarks.fake_server import FakeProviders, serve
+from benchmarks.synthetic import generate
+
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+PACKAGES = ["cobra", "memote", "yamllint", "requests", "python-libsbml", "scipy"]
+OWNER = "benchmark"
+HEAVY_MODULES = ["cobra", "memote", "optlang", "yamllint", "libsbml"]
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import runner
+tests = [test.__name__ for test in runner.TESTS]
+print(json.dumps({
+    "import_seconds": time.perf_counter() - start,
+    "tests": len(tests),
+    "heavy_modules": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def environment():
+    """Return the versions the measurements were taken with."""
+
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPOSITORY_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "packages": packages,
+        "revision": revision,
+    }
+
+
+def cold_start():
+    """Return the time a fresh interpreter takes to import the runner.
+
+    The runner is imported without tokens, like in the discovery job, and
+    lists its tests; the heavy libraries that were imported on the way are
+    reported as well.
+    """
+
+    environ = {
+        key: value for key, value in os.environ.items() if key not in ("GH_TOKEN", "GL_TOKEN")
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START % HEAVY_MODULES], cwd=REPOSITORY_ROOT,
+        env=environ, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def timed(function, *args, **kwargs):
+    """Return the result of calling *function* and the seconds it took."""
+
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_validate(runner, providers, name_with_owner, model, cache_root, skip_tests):
+    """Time validation of *name_with_owner* with an empty and a warm cache."""
+
+    from cache import DownloadCache
+
+    shutil.rmtree(cache_root, ignore_errors=True)
+    runner.DOWNLOAD_CACHE = DownloadCache(cache_root, runner.CACHE_MAX_MB * 2**20, runner.HTTP)
+    run_tests = runner.run_tests
+    if skip_tests:
+        # the tests still decide which formats are downloaded
+        runner.run_tests = lambda tests, context, **options: {}
+    timings = {}
+    try:
+        for run in ["cold", "warm"]:
+            # without earlier results every run validates the same release
+            (runner.RESULTS_DIR / f"{model}.json").unlink(missing_ok=True)
+            requests_before = providers.requests
+            _, seconds = timed(runner.validate, name_with_owner, "github")
+            timings[run] = {
+                "seconds": seconds,
+                "requests": providers.requests - requests_before,
+            }
+    finally:
+        runner.run_tests = run_tests
+    return timings
+
+
+def bench_metrics(runner, model, directory):
+    """Time ``model_metrics`` in every mode on a fresh context."""
+
+    from profiling import measure
+
+    timings = {}
+    for mode in ["cobra", "stream"]:
+        context = runner.ModelContext(model, runner.MODEL_FORMATS, directory)
+        profile = {}
+        with measure(profile):
+            metrics = runner.model_metrics(context, mode)
+        timings[mode] = {
+            "seconds": profile["wall_seconds"],
+            "cpu_seconds": profile["cpu_seconds"],
+            "peak_rss_mb": profile["peak_rss_mb"],
+            "formats": context.load_times if mode == "cobra" else context.count_times,
+            "metrics": metrics,
+        }
+    return timings
+
+
+def bench_tests(runner, model, directory):
+    """Time every test, including the model loading it needs."""
+
+    timings = {}
+    for test in runner.TESTS:
+        context = runner.ModelContext(model, runner.MODEL_FORMATS, directory)
+        print(f"Timing {test.__module__}.{test.__name__} on {model}")
+        result, seconds = timed(runner.result_json_string, test, context)
+        (key, entry), = result.items()
+        timings[key] = {
+            "seconds": seconds,
+            "load_seconds": sum(context.load_times.values()),
+            "cpu_seconds": entry["profile"]["cpu_seconds"],
+            "peak_rss_mb": entry["profile"]["peak_rss_mb"],
+            "status": entry["status"],
+        }
+    return timings
+
+
+def bench_matlab(model, directory):
+    """Time the MAT-file header inspection against loading the file."""
+
+    import cobra
+    import scipy.io
+    import matfile
+
+    path = Path(directory) / f"{model}.mat"
+    info, inspect_seconds = timed(matfile.inspect_mat, path)
+    _, loadmat_seconds = timed(scipy.io.loadmat, str(path))
+    loaded, load_seconds = timed(cobra.io.load_matlab_model, str(path))
+    counts = matfile.mat_counts(info)
+    return {
+        "inspect_seconds": inspect_seconds,
+        "loadmat_seconds": loadmat_seconds,
+        "cobra_load_seconds": load_seconds,
+        "counts": counts,
+        "counts_match": (
+            counts["reactions"] == len(loaded.reactions)
+            and counts["metabolites"] == len(loaded.metabolites)
+        ),
+        "problems": matfile.structure_problems(info),
+    }
+
+
+def bench_memote_shards(runner, model, directory, shards):
+    """Time the Memote score run serially and in *shards*, and compare them."""
+
+    import memote
+    from tests import memote as memote_test
+
+    context = runner.ModelContext(model, [".xml"], directory)
+    sbml_model = context.load(".xml")
+    timings = {}
+    scores = {}
+    for count in [1, shards]:
+        start = time.perf_counter()
+        results = memote_test._test_model(sbml_model.copy(), count)
+        report = json.loads(memote.suite.api.snapshot_report(results, config=None, html=False))
+        timings[str(count)] = time.perf_counter() - start
+        scores[count] = report["score"]
+    return {
+        "seconds": timings,
+        "total_score": scores[1]["total_score"],
+        "identical": scores[1] == scores[shards],
+    }
+
+
+def bench_exports(results_dir, repeat=20):
+    """Compare the result files with the compact exports in bytes and parse time.
+
+    The dashboard overview needs every result file in the current layout and
+    only ``summary.json`` in the new one; a trend across releases needs every
+    result file or only ``history.json``.
+    """
+
+    import summary
+
+    models = summary.load_results(results_dir)
+    payloads = {
+        "result_files": [path.read_bytes() for path in sorted(Path(results_dir).glob("*.json"))],
+        "summary": [json.dumps(summary.build_summary(models), **summary.COMPACT).encode()],
+        "history": [json.dumps(summary.build_history(models), **summary.COMPACT).encode()],
+    }
+    timings = {}
+    for name, contents in payloads.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for content in contents:
+                json.loads(content)
+        timings[name] = {
+            "files": len(contents),
+            "bytes": sum(len(content) for content in contents),
+            "parse_seconds": (time.perf_counter() - start) / repeat,
+        }
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 5000, 20000],
+        help="approximate reaction counts of the synthetic models",
+    )
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument(
+        "--models-dir", type=Path, default=REPOSITORY_ROOT / ".cache" / "benchmarks",
+        help="where generated models are kept between benchmark runs",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--results-dir", type=Path, default=REPOSITORY_ROOT / "results",
+        help="result files to compare with the compact exports",
+    )
+    parser.add_argument(
+        "--skip-tests", action="store_true",
+        help="time validation without tests and do not time tests on their own",
+    )
+    parser.add_argument(
+        "--memote-shards", type=int, default=0,
+        help="also compare the Memote score run serially and in this many shards",
+    )
+    args = parser.parse_args(argv)
+    output = Path(args.output).resolve()
+
+    startup = cold_start()
+    names = generate(args.models_dir, args.sizes, args.seed)
+    providers = FakeProviders()
+    for name in names.values():
+        providers.add(f"{OWNER}/{name}", args.models_dir / name)
+    server, url = serve(providers)
+
+    workdir = Path(tempfile.mkdtemp(prefix="gem-benchmark-"))
+    # the runner reads its configuration when imported
+    os.environ.update({
+        "GH_TOKEN": "benchmark",
+        "GL_TOKEN": "benchmark",
+        "GITHUB_API_URL": url,
+        "GITHUB_RAW_URL": url,
+        "GITLAB_URL": url,
+        "GEM_CACHE_DIR": str(workdir / ".cache"),
+    })
+    sys.path.insert(0, str(REPOSITORY_ROOT))
+    import runner
+
+    results = {
+        "environment": environment(),
+        "cold_start": startup,
+        "exports": bench_exports(args.results_dir),
+        "sizes": {},
+    }
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        runner.RESULTS_DIR.mkdir(exist_ok=True)
+        for size, name in names.items():
+            directory = args.models_dir / name
+            entry = {
+                "validate": bench_validate(
+                    runner, providers, f"{OWNER}/{name}", name,
+                    workdir / ".cache" / "downloads", args.skip_tests,
+                ),
+                "model_metrics": bench_metrics(runner, name, directory),
+                "matlab": bench_matlab(name, directory),
+            }
+            if not args.skip_tests:
+                entry["tests"] = bench_tests(runner, name, directory)
+            if args.memote_shards > 1:
+                entry["memote_shards"] = bench_memote_shards(
+                    runner, name, directory, args.memote_shards
+                )
+            results["sizes"][str(size)] = entry
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output, "w") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Generate synthetic standard-GEM models of a given size in every model format."""
+
+import random
+from pathlib import Path
+
+
+def build_model(name, reactions, seed=0):
+    """Return a cobra model with about *reactions* reactions.
+
+    The model has two compartments, roughly two metabolites per three
+    reactions, gene associations and annotations, so that loaders, linters
+    and Memote do representative work. The same *seed* gives the same model.
+    """
+
+    import cobra
+
+    rng = random.Random(seed)
+    model = cobra.Model(name)
+    model.compartments = {"c": "cytosol", "e": "extracellular space"}
+    n_metabolites = max(2 * reactions // 3, 10)
+    metabolites = []
+    for index in range(n_metabolites):
+        compartment = "e" if index % 10 == 0 else "c"
+        metabolite = cobra.Metabolite(
+            f"m{index:05d}{compartment}",
+            name=f"metabolite {index}",
+            formula=f"C{rng.randint(1, 30)}H{rng.randint(1, 60)}O{rng.randint(0, 20)}",
+            charge=rng.randint(-2, 1),
+            compartment=compartment,
+        )
+        metabolite.annotation = {"metanetx.chemical": f"MNXM{index}"}
+        metabolites.append(metabolite)
+    model.add_metabolites(metabolites)
+
+    external = [metabolite for metabolite in metabolites if metabolite.compartment == "e"]
+    new_reactions = []
+    for index in range(reactions - len(external)):
+        reaction = cobra.Reaction(
+            f"r{index:05d}",
+            name=f"reaction {index}",
+            lower_bound=rng.choice([-1000, 0]),
+            upper_bound=1000,
+        )
+        participants = rng.sample(metabolites, rng.randint(2, 4))
+        split = len(participants) // 2
+        reaction.add_metabolites(
+            {metabolite: -1 for metabolite in participants[:split]}
+            | {metabolite: 1 for metabolite in participants[split:]}
+        )
+        genes = [f"g{rng.randrange(reactions):05d}" for _ in range(rng.randint(0, 2))]
+        reaction.gene_reaction_rule = " or ".join(genes)
+        reaction.annotation = {"metanetx.reaction": f"MNXR{index}"}
+        new_reactions.append(reaction)
+    model.add_reactions(new_reactions)
+    for metabolite in external:
+        model.add_boundary(metabolite, type="exchange")
+    model.objective = new_reactions[0].id
+    return model
+
+
+def write_model(model, directory):
+    """Write *model* in every model format into *directory*."""
+
+    from cobra.io import save_json_model, save_matlab_model, save_yaml_model, write_sbml_model
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    writers = {
+        ".yml": save_yaml_model,
+        ".xml": write_sbml_model,
+        ".mat": save_matlab_model,
+        ".json": save_json_model,
+    }
+    for model_format, writer in writers.items():
+        writer(model, str(directory / f"{model.id}{model_format}"))
+
+
+def generate(directory, sizes, seed=0):
+    """Write one synthetic model per size below *directory* unless present.
+
+    Return the model names keyed by size.
+    """
+
+    names = {}
+    for size in sizes:
+        name = f"synthetic{size}-GEM"
+        target = Path(directory) / name
+        if not (target / f"{name}.json").is_file():
+            print(f"Generating {name}")
+            write_model(build_model(name, size, seed), target)
+        names[size] = name
+    return names
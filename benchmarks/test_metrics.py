@@ -0,0 +1,49 @@
+"""Check the streaming counts in ``metrics.py`` against the cobrapy loaders."""
+
+from metrics import count_sbml
+
+
+SBML = """<?xml version="1.0" encoding="UTF-8"?>
+<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1">
+  <model id="boundary">
+    <listOfCompartments>
+      <compartment id="e" constant="true"/>
+    </listOfCompartments>
+    <listOfSpecies>
+      <species id="M_a_e" compartment="e" hasOnlySubstanceUnits="false"
+               boundaryCondition="true" constant="false"/>
+      <species id="M_b_e" compartment="e" hasOnlySubstanceUnits="false"
+               boundaryCondition="true" constant="false"/>
+      <species id="M_c_e" compartment="e" hasOnlySubstanceUnits="false"
+               boundaryCondition="false" constant="false"/>
+    </listOfSpecies>
+    <listOfReactions>
+      <reaction id="R_EX_a_e" reversible="true" fast="false">
+        <listOfReactants>
+          <speciesReference species="M_a_e" stoichiometry="1" constant="true"/>
+        </listOfReactants>
+      </reaction>
+      <reaction id="R_r1" reversible="true" fast="false">
+        <listOfReactants>
+          <speciesReference species="M_b_e" stoichiometry="1" constant="true"/>
+        </listOfReactants>
+        <listOfProducts>
+          <speciesReference species="M_c_e" stoichiometry="1" constant="true"/>
+        </listOfProducts>
+      </reaction>
+    </listOfReactions>
+  </model>
+</sbml>
+"""
+
+
+def test_sbml_boundary_species(tmp_path):
+    from cobra.io import read_sbml_model
+
+    path = tmp_path / "boundary.xml"
+    path.write_text(SBML)
+    model = read_sbml_model(str(path))
+    counts = count_sbml(path)
+    # EX_a_e is listed, so only the boundary species b_e gets an exchange
+    assert counts["reactions"] == len(model.reactions) == 3
+    assert counts["metabolites"] == len(model.metabolites) == 3
@@ -0,0 +1,59 @@
+"""Run the runner into result shards against the local stand-in."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.fake_server import FakeProviders, serve
+from benchmarks.synthetic import build_model, write_model
+
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+# the runner reads its configuration when imported, so it runs in a fresh interpreter
+BACKFILL = """
+import runner
+runner.run_tests = lambda tests, context, **options: {}
+runner.backfill("benchmark/tiny", "github")
+"""
+
+
+def test_backfill_with_run_id(tmp_path):
+    write_model(build_model("tiny", 30), tmp_path / "model")
+    providers = FakeProviders()
+    # oldest first, as the tags are listed by the provider
+    tags = ["v1.0.0", "v1.1.0", "v1.2.0"]
+    providers.add("benchmark/tiny", tmp_path / "model", tags=tags)
+    server, url = serve(providers)
+    work = tmp_path / "work"
+    (work / "results").mkdir(parents=True)
+    environ = {
+        **os.environ,
+        "PYTHONPATH": str(REPOSITORY_ROOT),
+        "GH_TOKEN": "test",
+        "GITHUB_API_URL": url,
+        "GITHUB_RAW_URL": url,
+        "GITLAB_URL": url,
+        "GEM_CACHE_DIR": str(work / ".cache"),
+        "GEM_SHARDS_DIR": "shards",
+        "GITHUB_RUN_ID": "1",
+        "GITHUB_RUN_ATTEMPT": "1",
+    }
+    try:
+        subprocess.run(
+            [sys.executable, "-c", BACKFILL], cwd=work, env=environ, check=True
+        )
+        subprocess.run(
+            [sys.executable, str(REPOSITORY_ROOT / "runner.py"), "merge-results"],
+            cwd=work, env=environ, check=True,
+        )
+    finally:
+        server.shutdown()
+    with open(work / "results" / "tiny.json") as handle:
+        releases = json.load(handle)["tiny"]["releases"]
+    assert [tag for release in releases for tag in release] == tags[::-1]
+    # the files of every release are identical, so each is compared with the one before
+    deltas = [entry.get("delta") for release in releases for entry in release.values()]
+    assert all(delta and delta["against"] for delta in deltas[:-1])
+    assert not list((work / "shards").glob("*.json"))
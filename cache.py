@@ -0,0 +1,245 @@
+"""On-disk caches shared between validation runs."""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import requests
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadCache:
+    """Content-addressed store of downloaded files.
+
+    Entries are keyed by ``provider/repository/ref/path`` and point to a blob
+    named after the SHA-256 of its content, so identical files published by
+    several repositories or refs are stored once. Refs marked immutable (release
+    tags) are served from disk without any request, including remembered 404s;
+    branches are revalidated with ``If-None-Match`` so that an unchanged file
+    costs a 304 instead of a transfer. Least recently used blobs are evicted
+    once the store grows over *max_bytes*. Requests go through *http*, any
+    object with the ``get`` signature of :mod:`requests`.
+    """
+
+    def __init__(self, root, max_bytes, http=requests):
+        self.root = Path(root)
+        self.http = http
+        self.max_bytes = max_bytes
+        self.index_path = self.root / "index.json"
+        self.blobs_dir = self.root / "blobs"
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _entries(self):
+        if self._index is None:
+            try:
+                with open(self.index_path) as handle:
+                    self._index = json.load(handle)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=self.root, delete=False) as handle:
+            json.dump(self._index, handle)
+        os.replace(handle.name, self.index_path)
+
+    def blob_path(self, sha256):
+        """Return the location of the blob with the given digest."""
+
+        return self.blobs_dir / sha256[:2] / sha256
+
+    def _store(self, chunks):
+        """Write *chunks* of bytes into the blob store and return their digest."""
+
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=self.blobs_dir, delete=False) as handle:
+            for chunk in chunks:
+                digest.update(chunk)
+                handle.write(chunk)
+        sha256 = digest.hexdigest()
+        blob = self.blob_path(sha256)
+        blob.parent.mkdir(exist_ok=True)
+        os.replace(handle.name, blob)
+        return sha256
+
+    def fetch(self, url, key, destination, immutable=False, headers=None):
+        """Copy the file at *url* to *destination*, downloading only if needed.
+
+        Return the SHA-256 of the file, or ``None`` when it is not available.
+        """
+
+        with self._lock:
+            entry = self._entries().get(key)
+        fresh = (
+            entry is not None
+            and (entry["sha256"] is None or self.blob_path(entry["sha256"]).is_file())
+        )
+        if not (fresh and immutable):
+            request_headers = dict(headers or {})
+            if fresh and entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            with self.http.get(
+                url, headers=request_headers, stream=True, timeout=10
+            ) as response:
+                if response.status_code == 304:
+                    pass
+                elif response.ok:
+                    entry = {
+                        "sha256": self._store(response.iter_content(CHUNK_SIZE)),
+                        "etag": response.headers.get("ETag"),
+                    }
+                elif response.status_code == 404:
+                    entry = {"sha256": None, "etag": None}
+                else:
+                    # a failed transfer must not look like a missing file
+                    response.raise_for_status()
+
+        self._record(key, entry, destination)
+        return entry["sha256"]
+
+    def get(self, key, destination):
+        """Copy the cached file of *key* to *destination* without a request.
+
+        Return its SHA-256, or ``None`` for a file known to be missing. Raise
+        :class:`KeyError` when nothing is cached under *key*.
+        """
+
+        with self._lock:
+            entry = self._entries()[key]
+            if entry["sha256"] is not None and not self.blob_path(entry["sha256"]).is_file():
+                raise KeyError(key)
+        self._record(key, entry, destination)
+        return entry["sha256"]
+
+    def put(self, key, stream, destination):
+        """Store the file object *stream* under *key* and copy it to *destination*.
+
+        A *stream* of ``None`` records that the file does not exist. Return the
+        SHA-256 of the stored content.
+        """
+
+        entry = {"sha256": None, "etag": None}
+        if stream is not None:
+            entry["sha256"] = self._store(iter(lambda: stream.read(CHUNK_SIZE), b""))
+        self._record(key, entry, destination)
+        return entry["sha256"]
+
+    def _record(self, key, entry, destination):
+        """Mark *entry* as used, copy its blob to *destination* and save."""
+
+        with self._lock:
+            entry["accessed"] = time.time()
+            self._entries()[key] = entry
+            if entry["sha256"] is not None:
+                shutil.copyfile(self.blob_path(entry["sha256"]), destination)
+            self._evict()
+            self._save()
+
+    def _evict(self):
+        """Remove least recently used blobs until the store fits its budget."""
+
+        entries = self._entries()
+        sizes = {}
+        for entry in entries.values():
+            sha256 = entry["sha256"]
+            if sha256 and sha256 not in sizes:
+                blob = self.blob_path(sha256)
+                sizes[sha256] = blob.stat().st_size if blob.is_file() else 0
+        total = sum(sizes.values())
+        by_age = sorted(entries.items(), key=lambda item: item[1]["accessed"])
+        for key, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            sha256 = entry["sha256"]
+            del entries[key]
+            if sha256 and not any(e["sha256"] == sha256 for e in entries.values()):
+                self.blob_path(sha256).unlink(missing_ok=True)
+                total -= sizes[sha256]
+
+
+class ResultCache:
+    """SQLite store of test results keyed by everything a result depends on.
+
+    Keys are computed by the caller from the test, its tool version and the
+    hashes of its input files. Every entry also records the test and the tool
+    version, so that storing a result made with a new tool version drops the
+    entries of older versions of the same test. Least recently used entries
+    are evicted once the stored results grow over *max_bytes*. A connection is
+    opened per call, so the store can be used from forked workers and from
+    several processes at once.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, test TEXT, version TEXT,"
+            " result TEXT, size INTEGER, accessed REAL)"
+        )
+        return connection
+
+    def get(self, key):
+        """Return the cached result of *key*, or ``None``."""
+
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT result FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key, test, version, result):
+        """Store *result* of *test* run with tool *version* under *key*."""
+
+        value = json.dumps(result)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM results WHERE test = ? AND version != ?", (test, str(version))
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, test, str(version), value, len(value), time.time()),
+            )
+            self._evict(connection)
+
+    def invalidate(self, test=None):
+        """Remove the entries of *test*, or all entries, and return their number."""
+
+        with closing(self._connect()) as connection, connection:
+            if test is None:
+                return connection.execute("DELETE FROM results").rowcount
+            return connection.execute("DELETE FROM results WHERE test = ?", (test,)).rowcount
+
+    def _evict(self, connection):
+        """Remove least recently used entries until the store fits its budget."""
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT key, size FROM results ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
@@ -0,0 +1,122 @@
+"""Hash-indexed model contents for comparing releases without loading both.
+
+A model index holds a stable hash per reaction, over its stoichiometry,
+bounds and gene-reaction rule, and per metabolite, over its formula, charge
+and compartment, together with a separate hash of the names and annotations
+of each. Indexes are stored as arrays sorted by identifier, so comparing the
+index of a release with that of the previous one is a set difference.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+HASH_LENGTH = 16
+KINDS = ["reactions", "metabolites"]
+
+
+def _digest(value):
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:HASH_LENGTH]
+
+
+def reaction_hashes(reaction):
+    """Return the structure and annotation hashes of a cobra reaction."""
+
+    stoichiometry = sorted(
+        (metabolite.id, repr(float(coefficient)))
+        for metabolite, coefficient in reaction.metabolites.items()
+    )
+    structure = [
+        stoichiometry,
+        repr(float(reaction.lower_bound)),
+        repr(float(reaction.upper_bound)),
+        reaction.gene_reaction_rule.strip(),
+    ]
+    return _digest(structure), _digest([reaction.name, reaction.annotation])
+
+
+def metabolite_hashes(metabolite):
+    """Return the structure and annotation hashes of a cobra metabolite."""
+
+    structure = [metabolite.formula, metabolite.charge, metabolite.compartment]
+    return _digest(structure), _digest([metabolite.name, metabolite.annotation])
+
+
+def model_index(model):
+    """Return the index of a cobra model.
+
+    For each of ``KINDS`` the index has the sorted ``ids`` and, aligned with
+    them, the ``structure`` and ``annotation`` hashes. ``digest`` identifies
+    the structure of the whole model.
+    """
+
+    index = {}
+    for kind, hashes in [("reactions", reaction_hashes), ("metabolites", metabolite_hashes)]:
+        items = sorted(
+            (item.id,) + hashes(item) for item in getattr(model, kind)
+        )
+        index[kind] = {
+            "ids": [item[0] for item in items],
+            "structure": [item[1] for item in items],
+            "annotation": [item[2] for item in items],
+        }
+    index["digest"] = _digest([index[kind]["structure"] for kind in KINDS] + [
+        index[kind]["ids"] for kind in KINDS
+    ])
+    return index
+
+
+def compare_indexes(old, new):
+    """Return the added, removed, modified and re-annotated items per kind.
+
+    An item is modified when its structure hash changed and re-annotated
+    when only its annotation hash did.
+    """
+
+    delta = {}
+    for kind in KINDS:
+        before = dict(zip(old[kind]["ids"], zip(old[kind]["structure"], old[kind]["annotation"])))
+        after = dict(zip(new[kind]["ids"], zip(new[kind]["structure"], new[kind]["annotation"])))
+        common = before.keys() & after.keys()
+        delta[kind] = {
+            "added": len(after.keys() - before.keys()),
+            "removed": len(before.keys() - after.keys()),
+            "modified": sum(before[key][0] != after[key][0] for key in common),
+            "annotated": sum(
+                before[key][0] == after[key][0] and before[key][1] != after[key][1]
+                for key in common
+            ),
+        }
+    return delta
+
+
+class IndexStore:
+    """Gzipped model indexes on disk, keyed by the format and SHA-256 of the model file."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, model_format, sha256):
+        return self.root / f"{model_format.lstrip('.')}-{sha256}.json.gz"
+
+    def get(self, model_format, sha256):
+        """Return the stored index of a model file, or ``None``."""
+
+        try:
+            with gzip.open(self.path(model_format, sha256), "rt") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, model_format, sha256, index):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=self.root, delete=False) as handle:
+            # mtime 0 keeps the file identical for the same index
+            with gzip.GzipFile("", "wb", fileobj=handle, mtime=0) as compressed:
+                compressed.write(json.dumps(index, separators=(",", ":")).encode())
+        os.replace(handle.name, self.path(model_format, sha256))
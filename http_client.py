@@ -0,0 +1,191 @@
+"""Shared HTTP client with pooled connections, retries and rate limiting."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Quota headers sent by GitHub (REST and GraphQL) and by GitLab
+QUOTA_HEADERS = [
+    ("X-RateLimit-Remaining", "X-RateLimit-Reset"),
+    ("RateLimit-Remaining", "RateLimit-Reset"),
+]
+
+
+class TokenBucket:
+    """Token bucket pacing requests to one host.
+
+    Tokens refill at *rate* per second up to *burst*. Once the provider reports
+    that fewer than *reserve* requests are left in its quota window, the rate
+    drops so that the remaining requests are spread until the window resets,
+    and stops entirely while the quota is exhausted.
+    """
+
+    def __init__(self, rate, burst, reserve):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.quota_rate = None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                rate = self.rate if self.quota_rate is None else min(self.rate, self.quota_rate)
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / max(rate, 1e-3)
+            time.sleep(wait)
+
+    def update_quota(self, remaining, reset_at):
+        """Slow down according to the quota left until the epoch *reset_at*."""
+
+        with self._lock:
+            window = max(reset_at - time.time(), 1.0)
+            if remaining <= 0:
+                self.paused_until = time.monotonic() + window
+            elif remaining < self.reserve:
+                self.quota_rate = remaining / window
+                # no bursting through the little quota that is left
+                self.tokens = min(self.tokens, 1)
+            else:
+                self.quota_rate = None
+
+
+class HttpClient:
+    """HTTP client shared by all requests of a run.
+
+    Each host gets its own keep-alive :class:`requests.Session` and
+    :class:`TokenBucket`. Connection errors and responses with a status in
+    ``RETRY_STATUSES``, or a 403 caused by an exhausted quota, are retried up
+    to *retries* times with jittered exponential backoff, honouring
+    ``Retry-After``. Request counts, retries and latency are kept per host for
+    the run summary.
+    """
+
+    def __init__(self, retries=4, backoff=1.0, rate=10.0, burst=20, reserve=100, pool_size=16):
+        self.retries = retries
+        self.backoff = backoff
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._buckets = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._buckets[host] = TokenBucket(self.rate, self.burst, self.reserve)
+                self.stats[host] = {
+                    "requests": 0, "retries": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0,
+                }
+            return self._sessions[host], self._buckets[host], self.stats[host]
+
+    def _count(self, stats, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                stats[key] += value
+
+    def _delay(self, attempt, response=None):
+        """Return the seconds to wait before retrying."""
+
+        if response is not None and response.headers.get("Retry-After"):
+            retry_after = response.headers["Retry-After"]
+            try:
+                return float(retry_after)
+            except ValueError:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+        return self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+
+    def _observe_quota(self, bucket, response):
+        for remaining_header, reset_header in QUOTA_HEADERS:
+            remaining = response.headers.get(remaining_header)
+            reset = response.headers.get(reset_header)
+            if remaining is None or reset is None:
+                continue
+            reset_at = float(reset)
+            # GitHub and GitLab send an epoch, some proxies a delay in seconds
+            if reset_at < 10**9:
+                reset_at += time.time()
+            bucket.update_quota(int(remaining), reset_at)
+            return int(remaining)
+        return None
+
+    def request(self, method, url, **kwargs):
+        """Send a request, retrying transient failures, and return the response."""
+
+        kwargs.setdefault("timeout", 10)
+        session, bucket, stats = self._host(urlparse(url).netloc)
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._count(stats, requests=1)
+                if attempt == self.retries:
+                    self._count(stats, errors=1)
+                    raise
+                self._count(stats, retries=1)
+                time.sleep(self._delay(attempt))
+                continue
+            elapsed = time.perf_counter() - start
+            self._count(stats, requests=1, seconds=elapsed)
+            with self._lock:
+                stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            remaining = self._observe_quota(bucket, response)
+            rate_limited = response.status_code == 403 and remaining == 0
+            if (response.status_code in RETRY_STATUSES or rate_limited) and attempt < self.retries:
+                self._count(stats, retries=1)
+                response.close()
+                # an exhausted quota pauses the bucket until the window resets
+                if not rate_limited:
+                    time.sleep(self._delay(attempt, response))
+                continue
+            if response.status_code >= 500:
+                self._count(stats, errors=1)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def summary(self):
+        """Return request, retry, error and latency counters per host."""
+
+        with self._lock:
+            return {
+                host: dict(
+                    stats,
+                    mean_seconds=stats["seconds"] / stats["requests"] if stats["requests"] else 0.0,
+                )
+                for host, stats in self.stats.items()
+            }
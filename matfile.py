@@ -0,0 +1,345 @@
+"""Inspect COBRA MAT-files without loading their arrays.
+
+Only the headers of the variables and of the fields of the model struct are
+read: their MATLAB class, their shape and, for sparse matrices such as ``S``,
+their number of stored elements. Level 5 MAT-files (v5 to v7) are memory
+mapped; the variables that MATLAB compresses are inflated as a stream and
+the payload of every field is skipped without being kept. v7.3 files are
+HDF5 and are read with ``h5py``, which only touches dataset metadata.
+"""
+
+import mmap
+import struct
+import zlib
+from math import prod
+
+
+CHUNK_SIZE = 1024 * 1024
+HEADER_SIZE = 128
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+MI_INT8 = 1
+MI_INT32 = 5
+MI_UINT32 = 6
+MI_MATRIX = 14
+MI_COMPRESSED = 15
+CLASSES = {
+    1: "cell", 2: "struct", 3: "object", 4: "char", 5: "sparse", 6: "double",
+    7: "single", 8: "int8", 9: "uint8", 10: "int16", 11: "uint16", 12: "int32",
+    13: "uint32", 14: "int64", 15: "uint64", 16: "function", 17: "opaque",
+}
+# Classes whose flags are not followed by the shape and name of a matrix
+UNSHAPED_CLASSES = {"function", "opaque"}
+REQUIRED_FIELDS = ["rxns", "mets", "S"]
+REACTION_FIELDS = ["lb", "ub", "c", "rev", "rxnNames", "grRules", "rules", "subSystems"]
+METABOLITE_FIELDS = ["metNames", "metFormulas", "metCharges", "b"]
+
+
+class _Mapped:
+    """Sequential reader over a slice of a memory-mapped file."""
+
+    def __init__(self, mapped, start, end):
+        self.mapped = mapped
+        self.position = start
+        self.end = end
+
+    def read(self, size):
+        if self.position + size > self.end:
+            raise ValueError("MAT-file element runs past its end")
+        data = self.mapped[self.position:self.position + size]
+        self.position += size
+        return data
+
+    def skip(self, size):
+        if self.position + size > self.end:
+            raise ValueError("MAT-file element runs past its end")
+        self.position += size
+
+
+class _Inflated:
+    """Sequential reader over the inflated content of a compressed element."""
+
+    def __init__(self, mapped, start, end):
+        self.mapped = mapped
+        self.position = start
+        self.end = end
+        self.inflater = zlib.decompressobj()
+        self.buffer = b""
+
+    def _more(self):
+        if self.inflater.unconsumed_tail:
+            data = self.inflater.unconsumed_tail
+        elif self.position < self.end:
+            data = self.mapped[self.position:min(self.position + CHUNK_SIZE, self.end)]
+            self.position += len(data)
+        else:
+            return False
+        self.buffer += self.inflater.decompress(data, CHUNK_SIZE)
+        return True
+
+    def read(self, size):
+        while len(self.buffer) < size:
+            if not self._more():
+                raise ValueError("compressed MAT-file element ends early")
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def skip(self, size):
+        while size > len(self.buffer):
+            size -= len(self.buffer)
+            self.buffer = b""
+            if not self._more():
+                raise ValueError("compressed MAT-file element ends early")
+        self.buffer = self.buffer[size:]
+
+
+def _tag(stream, endian):
+    """Read an element tag and return its type, size and small-element data."""
+
+    raw = stream.read(8)
+    first, second = struct.unpack(endian + "II", raw)
+    if first >> 16:
+        return first & 0xFFFF, first >> 16, raw[4:4 + (first >> 16)]
+    return first, second, None
+
+
+def _element(stream, endian):
+    """Read a whole element and return its type, data and size in the stream."""
+
+    data_type, size, small = _tag(stream, endian)
+    if small is not None:
+        return data_type, small, 8
+    data = stream.read(size)
+    padding = -size % 8
+    stream.skip(padding)
+    return data_type, data, 8 + size + padding
+
+
+def _matrix_header(stream, endian):
+    """Read the flags, shape and name of a matrix and the bytes they took.
+
+    Function handles and objects have neither, their shape and name are
+    ``None``.
+    """
+
+    _, flags, used = _element(stream, endian)
+    flags_word, nzmax = struct.unpack(endian + "II", flags[:8])
+    matlab_class = CLASSES.get(flags_word & 0xFF, "unknown")
+    if matlab_class in UNSHAPED_CLASSES:
+        return {"class": matlab_class, "shape": None}, None, used
+    _, dims, dims_used = _element(stream, endian)
+    _, name, name_used = _element(stream, endian)
+    header = {
+        "class": matlab_class,
+        "shape": list(struct.unpack(endian + f"{len(dims) // 4}i", dims)),
+    }
+    if header["class"] == "sparse":
+        header["nzmax"] = nzmax
+    return header, name.decode("latin-1"), used + dims_used + name_used
+
+
+def _struct_fields(stream, endian):
+    """Read the field headers of a 1x1 struct, skipping the field contents."""
+
+    _, length, _ = _element(stream, endian)
+    (name_length,) = struct.unpack(endian + "i", length[:4])
+    _, names, _ = _element(stream, endian)
+    fields = {}
+    for offset in range(0, len(names), name_length):
+        field = names[offset:offset + name_length].split(b"\0", 1)[0].decode("latin-1")
+        data_type, size, _ = _tag(stream, endian)
+        if data_type != MI_MATRIX:
+            raise ValueError(f"field {field} is not a MAT-file matrix")
+        if size == 0:
+            fields[field] = {"class": "double", "shape": [0, 0]}
+            continue
+        header, _, used = _matrix_header(stream, endian)
+        stream.skip(size - used)
+        fields[field] = header
+    return fields
+
+
+def _inspect_v5(path):
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        endian = "<" if mapped[126:128] == b"IM" else ">"
+        variables = {}
+        compressed = False
+        position = HEADER_SIZE
+        while position + 8 <= len(mapped):
+            data_type, size = struct.unpack(endian + "II", mapped[position:position + 8])
+            start = position + 8
+            if data_type == MI_COMPRESSED:
+                compressed = True
+                stream = _Inflated(mapped, start, start + size)
+                data_type, _, _ = _tag(stream, endian)
+                position = start + size
+            else:
+                stream = _Mapped(mapped, start, start + size)
+                position = start + size + (-size % 8)
+            if data_type != MI_MATRIX:
+                continue
+            header, name, _ = _matrix_header(stream, endian)
+            if name is None:
+                continue
+            if header["class"] == "struct" and prod(header["shape"]) == 1:
+                header["fields"] = _struct_fields(stream, endian)
+            variables[name] = header
+    return {"version": "5", "compressed": compressed, "variables": variables}
+
+
+def _h5_class(node):
+    value = node.attrs.get("MATLAB_class", b"")
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _inspect_v73(path):
+    try:
+        import h5py
+    except ImportError as error:
+        raise ImportError("inspecting MAT-files v7.3 requires h5py") from error
+
+    variables = {}
+    with h5py.File(path, "r") as handle:
+        for name, node in handle.items():
+            if name.startswith("#"):
+                continue
+            header = {"class": _h5_class(node)}
+            if isinstance(node, h5py.Group) and header["class"] == "struct":
+                header["shape"] = [1, 1]
+                header["fields"] = {
+                    field: _h5_header(h5py, child) for field, child in node.items()
+                }
+            else:
+                header.update(_h5_header(h5py, node))
+            variables[name] = header
+    return {"version": "7.3", "compressed": None, "variables": variables}
+
+
+def _h5_header(h5py, node):
+    """Return the class and shape of an HDF5 node as MATLAB sees them."""
+
+    if isinstance(node, h5py.Group):
+        if "MATLAB_sparse" in node.attrs:
+            data = node.get("data")
+            return {
+                "class": "sparse",
+                "shape": [int(node.attrs["MATLAB_sparse"]), node["jc"].shape[0] - 1],
+                "nzmax": data.shape[0] if data is not None else 0,
+            }
+        return {"class": _h5_class(node), "shape": [1, 1]}
+    if node.attrs.get("MATLAB_empty"):
+        return {"class": _h5_class(node), "shape": [0, 0]}
+    # HDF5 stores MATLAB arrays transposed
+    return {"class": _h5_class(node), "shape": list(reversed(node.shape))}
+
+
+def mat_version(path):
+    """Return the MAT-file version of *path*, "5" or "7.3", or ``None`` for another file."""
+
+    with open(path, "rb") as handle:
+        header = handle.read(HEADER_SIZE)
+        handle.seek(512)
+        signature = handle.read(len(HDF5_SIGNATURE))
+    if signature == HDF5_SIGNATURE or header.startswith(HDF5_SIGNATURE):
+        return "7.3"
+    if len(header) == HEADER_SIZE and header[126:128] in (b"IM", b"MI"):
+        return "5"
+    return None
+
+
+def inspect_mat(path):
+    """Return the variable headers of a MAT-file.
+
+    The result has the file ``version`` ("5" for v5 to v7, "7.3" for HDF5),
+    whether any variable is ``compressed`` and the ``variables`` by name, each
+    with its MATLAB ``class`` and ``shape``; sparse matrices also have their
+    ``nzmax``, and 1x1 structs the headers of their ``fields``. Raise
+    :class:`ValueError` for headers that cannot be read.
+    """
+
+    version = mat_version(path)
+    if version is None:
+        raise ValueError(f"{path} is not a MAT-file")
+    try:
+        return _inspect_v73(path) if version == "7.3" else _inspect_v5(path)
+    except (struct.error, zlib.error, IndexError, KeyError, TypeError) as error:
+        raise ValueError(f"Could not read the headers of {path}: {error!r}") from error
+
+
+def model_struct(info):
+    """Return the name and fields of the COBRA model struct, or ``None``."""
+
+    for name in sorted(info["variables"]):
+        fields = info["variables"][name].get("fields") or {}
+        if "rxns" in fields and "mets" in fields:
+            return name, fields
+    return None
+
+
+def _size(fields, field):
+    shape = fields[field]["shape"] if field in fields else None
+    return prod(shape) if shape else 0
+
+
+def mat_counts(info):
+    """Return the component counts of the model struct of an inspected file."""
+
+    found = model_struct(info)
+    if found is None:
+        raise ValueError("No COBRA model struct found")
+    _, fields = found
+    return {
+        "reactions": _size(fields, "rxns"),
+        "metabolites": _size(fields, "mets"),
+        "genes": _size(fields, "genes"),
+        "compartments": _size(fields, "comps"),
+    }
+
+
+def structure_problems(info):
+    """Return the inconsistencies between the fields of the model struct.
+
+    Required fields must be present, ``S`` must have a row per metabolite
+    and a column per reaction, and the per-reaction and per-metabolite
+    fields present must have an item per reaction or metabolite.
+    """
+
+    found = model_struct(info)
+    if found is None:
+        return ["No COBRA model struct found"]
+    _, fields = found
+    problems = [f"missing field {field}" for field in REQUIRED_FIELDS if field not in fields]
+    reactions = _size(fields, "rxns")
+    metabolites = _size(fields, "mets")
+    if "S" in fields and fields["S"]["shape"] != [metabolites, reactions]:
+        shape = "x".join(str(size) for size in fields["S"]["shape"] or []) or "not a matrix"
+        problems.append(f"S is {shape}, expected {metabolites}x{reactions}")
+    for names, count, kind in [
+        (REACTION_FIELDS, reactions, "reactions"),
+        (METABOLITE_FIELDS, metabolites, "metabolites"),
+    ]:
+        for field in names:
+            if field in fields and _size(fields, field) not in (0, count):
+                problems.append(f"{field} has {_size(fields, field)} items for {count} {kind}")
+    return problems
+
+
+def precheck(path):
+    """Raise for a file cobrapy cannot load as a model, else return its headers.
+
+    That is a file that is not a MAT-file, a v7.3 file, which cobrapy does
+    not read, or one without a COBRA model struct. Return ``None`` when the
+    headers cannot be read, leaving the file to cobrapy.
+    """
+
+    version = mat_version(path)
+    if version is None:
+        raise ValueError(f"{path} is not a MAT-file")
+    if version == "7.3":
+        raise ValueError("MAT-file v7.3 (HDF5) is not supported by cobrapy, save it with -v7")
+    try:
+        info = inspect_mat(path)
+    except ValueError:
+        return None
+    if model_struct(info) is None:
+        raise ValueError(f"No COBRA model found at {path}.")
+    return info
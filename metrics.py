@@ -0,0 +1,204 @@
+"""Count model components by streaming model files, without building cobra models.
+
+Each counter reads one format incrementally and returns the number of
+reactions, metabolites, genes and compartments the corresponding cobrapy
+loader would create, so the counts can be compared with those of a loaded
+model.
+"""
+
+import json
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+
+from matfile import inspect_mat, mat_counts
+
+
+CHUNK_SIZE = 1024 * 1024
+COMPONENTS = ["reactions", "metabolites", "genes", "compartments"]
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clip(sid, prefix):
+    return sid[len(prefix):] if sid.startswith(prefix) else sid
+
+
+def count_sbml(path):
+    """Count components of an SBML file with ``iterparse``."""
+
+    counts = dict.fromkeys(COMPONENTS, 0)
+    lists = {
+        "listOfReactions": "reactions",
+        "listOfSpecies": "metabolites",
+        "listOfGeneProducts": "genes",
+        "listOfCompartments": "compartments",
+    }
+    # cobrapy adds an exchange reaction per boundary species, unless one with its id exists
+    exchanges = set()
+    listed = set()
+    current = None
+    depth = 0
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        name = _local_name(element.tag)
+        if event == "start":
+            depth += 1
+            if name in lists:
+                current, list_depth = lists[name], depth
+            elif current and depth == list_depth + 1:
+                counts[current] += 1
+                if current == "metabolites" and element.get("boundaryCondition") == "true":
+                    exchanges.add("EX_" + _clip(element.get("id", ""), "M_"))
+                elif current == "reactions":
+                    reaction = _clip(element.get("id", ""), "R_")
+                    if reaction.startswith("EX_"):
+                        listed.add(reaction)
+        else:
+            depth -= 1
+            if name in lists:
+                current = None
+            if current is None or depth <= list_depth:
+                element.clear()
+    counts["reactions"] += len(exchanges - listed)
+    return counts
+
+
+def count_yaml(path):
+    """Count components of a cobrapy YAML file from its parser events."""
+
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    counts = dict.fromkeys(COMPONENTS, 0)
+    # one frame per open collection: [kind, counted section, expecting key, last key]
+    stack = []
+    node_events = (
+        yaml.ScalarEvent, yaml.AliasEvent, yaml.SequenceStartEvent, yaml.MappingStartEvent
+    )
+    with open(path, "rb") as handle:
+        for event in yaml.parse(handle, Loader=loader):
+            if isinstance(event, node_events):
+                is_key = False
+                section = None
+                if stack:
+                    parent = stack[-1]
+                    if parent[0] == "map":
+                        is_key = parent[2]
+                        parent[2] = not parent[2]
+                        if is_key:
+                            parent[3] = getattr(event, "value", None)
+                    if parent[1] and not is_key:
+                        counts[parent[1]] += 1
+                    # the model is a sequence of single-key mappings
+                    if len(stack) == 2 and not is_key and parent[3] in counts:
+                        section = parent[3]
+                if isinstance(event, yaml.SequenceStartEvent):
+                    stack.append(["seq", section, False, None])
+                elif isinstance(event, yaml.MappingStartEvent):
+                    stack.append(["map", section, True, None])
+            elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                stack.pop()
+    return counts
+
+
+# complete strings, a string cut off at the end of the buffer, or structure
+_JSON_TOKEN = re.compile(
+    r'(?P<string>"(?:[^"\\]|\\.)*")|(?P<cut>"(?:[^"\\]|\\.)*\\?\Z)|[{}\[\]:]',
+    re.DOTALL,
+)
+
+
+def count_json(path):
+    """Count components of a cobrapy JSON file with an incremental tokenizer."""
+
+    counts = dict.fromkeys(COMPONENTS, 0)
+    depth = 0
+    key = None
+    section = None
+    section_kind = None
+    carry = ""
+    with open(path, encoding="utf-8") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), ""):
+            text = carry + chunk
+            carry = ""
+            for match in _JSON_TOKEN.finditer(text):
+                token = match.group()
+                if match.lastgroup == "cut":
+                    carry = token
+                    break
+                if match.lastgroup == "string":
+                    if depth == 1:
+                        key = token
+                elif token in "{[":
+                    depth += 1
+                    if depth == 2 and key and json.loads(key) in counts:
+                        section, section_kind = json.loads(key), token
+                    elif section and section_kind == "[" and depth == 3:
+                        counts[section] += 1
+                elif token in "}]":
+                    depth -= 1
+                    if depth < 2:
+                        section = None
+                elif token == ":" and section and section_kind == "{" and depth == 2:
+                    counts[section] += 1
+    return counts
+
+
+def count_matlab(path):
+    """Count components of a COBRA MAT file from the headers of its struct fields."""
+
+    return mat_counts(inspect_mat(path))
+
+
+COUNTERS = {
+    ".yml": count_yaml,
+    ".xml": count_sbml,
+    ".mat": count_matlab,
+    ".json": count_json,
+}
+
+
+def stream_metrics(paths, details=False):
+    """Return cross-format checked counts and the counting time per format.
+
+    *paths* maps each model format to its file. Formats that cannot be read are
+    skipped, like in ``runner.model_metrics``; a disagreement in reaction or
+    metabolite counts raises :class:`ValueError`. With *details*, gene and
+    compartment counts from the first readable format are included.
+    """
+
+    metrics = None
+    metrics_source = None
+    timings = {}
+    for model_format, model_path in paths.items():
+        model_path = Path(model_path)
+        if not model_path.is_file():
+            continue
+        start = time.perf_counter()
+        try:
+            counts = COUNTERS[model_format](model_path)
+        except Exception as error:
+            print(f"Could not count components in {model_path}: {error}")
+            continue
+        finally:
+            timings[model_format] = time.perf_counter() - start
+        format_metrics = {
+            "reactions": counts["reactions"],
+            "metabolites": counts["metabolites"],
+        }
+        if metrics is None:
+            metrics = dict(format_metrics)
+            metrics_source = model_path
+            if details:
+                metrics["genes"] = counts["genes"]
+                metrics["compartments"] = counts["compartments"]
+        elif any(metrics[key] != value for key, value in format_metrics.items()):
+            raise ValueError(
+                "Model metrics do not match across formats: "
+                f"{metrics_source} has {metrics}, but {model_path} has "
+                f"{format_metrics}"
+            )
+    return metrics or {"reactions": None, "metabolites": None}, timings
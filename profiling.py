@@ -0,0 +1,71 @@
+"""Wall time, CPU time and peak memory measurements of validation steps."""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MiB, or ``None``."""
+
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(maxrss / (2**20 if sys.platform == "darwin" else 1024), 1)
+
+
+def reset_peak_rss():
+    """Restart peak tracking at the current resident set size where supported.
+
+    Linux resets the high-water mark reported by :func:`peak_rss_mb` when
+    ``5`` is written to ``/proc/self/clear_refs``; elsewhere the peak keeps
+    covering the whole life of the process.
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+@contextmanager
+def measure(profile, cpu_clock=time.process_time):
+    """Record the wall time, CPU time and peak RSS of the block into *profile*.
+
+    *cpu_clock* is :func:`time.process_time` by default; steps running in a
+    thread next to others use :func:`time.thread_time` instead. The peak RSS is
+    that of the whole process while the block ran.
+    """
+
+    reset_peak_rss()
+    wall_start = time.perf_counter()
+    cpu_start = cpu_clock()
+    try:
+        yield profile
+    finally:
+        profile["wall_seconds"] = round(time.perf_counter() - wall_start, 3)
+        profile["cpu_seconds"] = round(cpu_clock() - cpu_start, 3)
+        profile["peak_rss_mb"] = peak_rss_mb()
+
+
+def combine(profiles):
+    """Return the summed times and the highest peak of several profiles."""
+
+    profiles = [profile for profile in profiles if profile]
+    peaks = [profile["peak_rss_mb"] for profile in profiles if profile.get("peak_rss_mb")]
+    return {
+        "wall_seconds": round(sum(profile.get("wall_seconds") or 0 for profile in profiles), 3),
+        "cpu_seconds": round(sum(profile.get("cpu_seconds") or 0 for profile in profiles), 3),
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
@@ -1,53 +1,255 @@
 """Utility functions to validate GEM repositories against the standard."""
 
+import argparse
+import ast
+import asyncio
+import cProfile
+import difflib
+import functools
+import hashlib
 import json
 import inspect
+import multiprocessing
 import re
-import requests
-from importlib import import_module
-from os import environ
+import shutil
+import signal
+import tarfile
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module, metadata
+from os import environ, getpid, kill
 from pathlib import Path
 from urllib.parse import quote, urlparse
 
+from cache import DownloadCache, ResultCache
+from delta import IndexStore, compare_indexes, model_index
+from matfile import precheck, structure_problems
+from http_client import HttpClient
+from metrics import stream_metrics
+from profiling import combine, measure
 
-# GitHub configuration
-GITHUB_ENDPOINT = "https://api.github.com/graphql"
+
+# GitHub configuration, the base URLs can point to a local stand-in server
+GITHUB_API_URL = environ.get("GITHUB_API_URL", "https://api.github.com")
+GITHUB_RAW_URL = environ.get("GITHUB_RAW_URL", "https://raw.githubusercontent.com")
+GITHUB_ENDPOINT = f"{GITHUB_API_URL}/graphql"
 GITHUB_TOKEN = environ.get("GH_TOKEN")
-if not GITHUB_TOKEN:
-    raise EnvironmentError("GH_TOKEN environment variable not set")
-GITHUB_HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"}
 
 # GitLab configuration
-GITLAB_ENDPOINT = "https://gitlab.com/api/graphql"
+GITLAB_URL = environ.get("GITLAB_URL", "https://gitlab.com")
+GITLAB_ENDPOINT = f"{GITLAB_URL}/api/graphql"
 GITLAB_TOKEN = environ.get("GL_TOKEN")
-if not GITLAB_TOKEN:
-    raise EnvironmentError("GL_TOKEN environment variable not set")
-GITLAB_HEADERS = {"Authorization": f"Bearer {GITLAB_TOKEN}"}
 
 MODEL_FILENAME = "model"
+STANDARD_FILENAME = ".standard-GEM.md"
+STANDARD_REPOSITORY = "MetabolicAtlas/standard-GEM"
 MODEL_FORMATS = [".yml", ".xml", ".mat", ".json"]
 RELEASES = 10
+# Repositories looked up per GraphQL request
+GRAPHQL_BATCH = 50
+# Repositories per page of the discovery searches
+DISCOVERY_PAGE = 100
+# Last activity of the repositories whose results are complete
+ACTIVITY_FILE = Path("activity.json")
+# Last activity found by discovery, recorded by merge_results()
+DISCOVERED_FILE = Path("discovered.json")
+# Repositories scheduled for validation by matrix()
+MATRIX_FILE = Path("matrix.json")
 ADDITIONAL_BRANCHES = ["main"]
 AVATARS_DIR = Path("avatars")
 RESULTS_DIR = Path("results")
+# Where result shards are written instead of the result files, merged later
+# by merge_results(); unset writes the result files directly
+SHARDS_DIR = Path(environ["GEM_SHARDS_DIR"]) if environ.get("GEM_SHARDS_DIR") else None
+
+# How model files are fetched per provider: "raw" requests each file,
+# "archive" streams the release tarball once
+FETCH_MODES = {
+    "github": environ.get("GITHUB_FETCH_MODE", "raw"),
+    "gitlab": environ.get("GITLAB_FETCH_MODE", "raw"),
+}
+
+# All requests share pooled connections, retries and per-host rate limits
+HTTP = HttpClient(
+    retries=int(environ.get("HTTP_RETRIES", "4")),
+    rate=float(environ.get("HTTP_RATE", "10")),
+)
+
+# Downloads are kept between runs in a content-addressed cache
+CACHE_DIR = Path(environ.get("GEM_CACHE_DIR", ".cache"))
+CACHE_MAX_MB = int(environ.get("GEM_CACHE_MAX_MB", "2048"))
+DOWNLOAD_CACHE = DownloadCache(CACHE_DIR / "downloads", CACHE_MAX_MB * 2**20, HTTP)
+# Indexes of model contents by file hash, for comparing releases; the
+# workflow restores them with the rest of the cache of each repository
+MODEL_INDEXES = IndexStore(CACHE_DIR / "model-index")
+# Formats a model index is built from, in order of preference
+INDEX_FORMATS = [".xml", ".yml", ".json", ".mat"]
+# Test results are kept by test, tool version and input hashes (0 = disabled)
+RESULT_CACHE_MAX_MB = int(environ.get("GEM_RESULT_CACHE_MAX_MB", "256"))
+RESULT_CACHE = (
+    ResultCache(CACHE_DIR / "results.sqlite", RESULT_CACHE_MAX_MB * 2**20)
+    if RESULT_CACHE_MAX_MB
+    else None
+)
+
+# How model_metrics counts components: "cobra" loads every format with cobrapy,
+# "stream" counts them from the files without building models
+METRICS_MODE = environ.get("GEM_METRICS_MODE", "cobra")
+
+# Test execution: worker processes (0 runs tests in the runner process),
+# wall-clock limit per test in seconds and RSS cap per test in MiB (0 = none)
+TEST_WORKERS = int(environ.get("TEST_WORKERS", "2"))
+TEST_TIMEOUT = float(environ.get("TEST_TIMEOUT", "3600"))
+TEST_MAX_RSS_MB = int(environ.get("TEST_MAX_RSS_MB", "0"))
+# Write a cProfile dump of every test below this directory when set
+PROFILE_DIR = environ.get("GEM_PROFILE_DIR")
+# Memory use of evaluating a release: "normal" keeps parsed models in the
+# runner for the tests to share, "low" counts metrics from the files and runs
+# one test at a time, each parsing what it needs in its own worker
+MEMORY_MODE = environ.get("GEM_MEMORY_MODE", "normal")
+# Peak RSS budget of the runner and its test worker together in MiB (0 = none)
+RSS_BUDGET_MB = int(environ.get("GEM_RSS_BUDGET_MB", "0"))
+
+# Batch validation: repositories evaluated at the same time and concurrent
+# repositories per provider during network I/O
+BATCH_WORKERS = int(environ.get("BATCH_WORKERS", "2"))
+PROVIDER_CONCURRENCY = {
+    "github": int(environ.get("GITHUB_CONCURRENCY", "8")),
+    "gitlab": int(environ.get("GITLAB_CONCURRENCY", "4")),
+}
+
+# Seconds a backfill run may spend on one repository (0 = no limit)
+BACKFILL_BUDGET = float(environ.get("BACKFILL_BUDGET", "0"))
+
+# Comma-separated names of the tests to run, as "loadYaml" or
+# "tests.cobra.loadYaml"; all discovered tests when unset
+ENABLED_TESTS = environ.get("GEM_TESTS")
+# Cost classes of tests, in the order tests are run
+TEST_COSTS = ["cheap", "expensive"]
+
+
+def github_headers():
+    """Return the GitHub API headers, failing only once ``GH_TOKEN`` is needed."""
+
+    if not GITHUB_TOKEN:
+        raise EnvironmentError("GH_TOKEN environment variable not set")
+    return {"Authorization": f"token {GITHUB_TOKEN}"}
+
+
+def gitlab_headers(rest=False):
+    """Return the GitLab GraphQL headers, or the REST ones with *rest*."""
+
+    if not GITLAB_TOKEN:
+        raise EnvironmentError("GL_TOKEN environment variable not set")
+    if rest:
+        return {"Private-Token": GITLAB_TOKEN}
+    return {"Authorization": f"Bearer {GITLAB_TOKEN}"}
+
+
+class RegisteredTest:
+    """A test function of the tests package, imported on first use."""
+
+    def __init__(self, module, name, formats, cost="cheap", key=None, tool=None):
+        self.__module__ = module
+        self.__name__ = name
+        self.formats = formats
+        self.cost = cost
+        self.key = key
+        self.tool = tool
+
+    def __repr__(self):
+        return f"<test {self.__module__}.{self.__name__} {list(self.formats)} {self.cost}>"
+
+    @property
+    def function(self):
+        """Return the test function, importing its module."""
+
+        return getattr(import_module(self.__module__), self.__name__)
+
+    def __call__(self, context):
+        return self.function(context)
+
+
+def _test_formats(function_node):
+    """Return the formats a test passes to ``context.load`` or ``context.path``."""
+
+    formats = []
+    for node in ast.walk(function_node):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("load", "path")
+            and getattr(node.func.value, "id", None) == "context"
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and node.args[0].value not in formats
+        ):
+            formats.append(node.args[0].value)
+    return tuple(formats)
+
+
+def _test_declaration(function_node):
+    """Return the formats, cost class, result key and tool a test declares with ``@check``."""
+
+    for decorator in function_node.decorator_list:
+        name = getattr(decorator, "func", None)
+        if getattr(name, "id", getattr(name, "attr", None)) != "check":
+            continue
+        formats = tuple(arg.value for arg in decorator.args if isinstance(arg, ast.Constant))
+        declared = {"cost": "cheap", "key": None, "tool": None}
+        for keyword in decorator.keywords:
+            if keyword.arg in declared and isinstance(keyword.value, ast.Constant):
+                declared[keyword.arg] = keyword.value.value
+        return formats, declared["cost"], declared["key"], declared["tool"]
+    return _test_formats(function_node), "cheap", None, None
 
 
 def discover_tests():
-    """Return all test callables found in the tests package."""
+    """Return the public functions of the test modules without importing them."""
 
     test_functions = []
     tests_dir = Path(__file__).resolve().parent / "tests"
-    for module_path in tests_dir.glob("*.py"):
-        module_name = f"tests.{module_path.stem}"
+    for module_path in sorted(tests_dir.glob("*.py")):
+        if module_path.stem.startswith("_"):
+            continue
         try:
-            module = import_module(module_name)
-        except Exception:
+            tree = ast.parse(module_path.read_text(), filename=str(module_path))
+        except SyntaxError:
             continue
-        for name, func in inspect.getmembers(module, inspect.isfunction):
-            if not name.startswith("_"):
-                test_functions.append(func)
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+                module = f"tests.{module_path.stem}"
+                if ENABLED_TESTS and not {node.name, f"{module}.{node.name}"} & {
+                    name.strip() for name in ENABLED_TESTS.split(",")
+                }:
+                    continue
+                test_functions.append(
+                    RegisteredTest(module, node.name, *_test_declaration(node))
+                )
     return test_functions
 
+
+def required_formats(tests):
+    """Return the model formats needed by *tests*, in ``MODEL_FORMATS`` order."""
+
+    needed = {model_format for test in tests for model_format in test.formats}
+    return [model_format for model_format in MODEL_FORMATS if model_format in needed]
+
+
+def plan_tests(tests, formats):
+    """Split *tests* into those to run, cheap ones first, and those missing a format."""
+
+    runnable = []
+    skipped = []
+    for test in tests:
+        if set(getattr(test, "formats", ())) <= set(formats):
+            runnable.append(test)
+        else:
+            skipped.append(test)
+    runnable.sort(key=lambda test: TEST_COSTS.index(getattr(test, "cost", "cheap")))
+    return runnable, skipped
+
 TESTS = discover_tests()
 
 # TESTS = [
@@ -61,75 +263,224 @@ TESTS = discover_tests()
 # ]
 
 def github_repositories():
-    """Return GitHub repositories tagged with standard-GEM excluding the template."""
-
-    json_request = {
-        "query": """
-        { search(
-            type: REPOSITORY,
-            query: \"\"\"fork:true topic:standard-gem\"\"\",
-            first: 100
-        ) {
-            repos: edges {
-                repo: node {
-                    ... on Repository { nameWithOwner }
-                }
-            }
-        }}
-        """,
-    }
-    response = requests.post(
-        GITHUB_ENDPOINT, json=json_request, headers=GITHUB_HEADERS, timeout=10
-    )
-    response.raise_for_status()
-    data = response.json()["data"]["search"]["repos"]
-    repositories = (edge["repo"]["nameWithOwner"] for edge in data)
+    """Return GitHub repositories tagged with standard-GEM and their last push time."""
+
+    repositories = {}
+    cursor = None
+    while True:
+        after = f', after: "{cursor}"' if cursor else ""
+        json_request = {
+            "query": f"""
+            {{ search(
+                type: REPOSITORY,
+                query: \"\"\"fork:true topic:standard-gem\"\"\",
+                first: {DISCOVERY_PAGE}{after}
+            ) {{
+                repos: edges {{
+                    repo: node {{
+                        ... on Repository {{ nameWithOwner pushedAt }}
+                    }}
+                }}
+                pageInfo {{ hasNextPage endCursor }}
+            }}}}
+            """,
+        }
+        response = HTTP.post(
+            GITHUB_ENDPOINT, json=json_request, headers=github_headers(), timeout=10
+        )
+        response.raise_for_status()
+        search = response.json()["data"]["search"]
+        for edge in search["repos"]:
+            if edge["repo"].get("nameWithOwner"):
+                repositories[edge["repo"]["nameWithOwner"]] = edge["repo"].get("pushedAt")
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        cursor = search["pageInfo"]["endCursor"]
     # "standard-GEM" is itself a repository - make sure to avoid it
-    return [repo for repo in repositories if "standard-GEM" not in repo]
+    return {
+        repo: pushed_at for repo, pushed_at in repositories.items() if "standard-GEM" not in repo
+    }
 
 def gitlab_repositories():
-    """Return GitLab projects tagged with standard-GEM."""
+    """Return GitLab projects tagged with standard-GEM and their last activity time."""
 
-    json_request = {
-        "query": """
-        { projects(topics: [\"standard-gem\"], first: 100) {
-            edges {
-                node { fullPath }
-            }
-        }}
-        """,
-    }
-    response = requests.post(
-        GITLAB_ENDPOINT, json=json_request, headers=GITLAB_HEADERS, timeout=10
-    )
-    response.raise_for_status()
-    data = response.json()["data"]["projects"]["edges"]
-    repositories = [edge["node"]["fullPath"] for edge in data]
+    repositories = {}
+    cursor = None
+    while True:
+        after = f', after: "{cursor}"' if cursor else ""
+        json_request = {
+            "query": f"""
+            {{ projects(topics: [\"standard-gem\"], first: {DISCOVERY_PAGE}{after}) {{
+                edges {{
+                    node {{ fullPath lastActivityAt }}
+                }}
+                pageInfo {{ hasNextPage endCursor }}
+            }}}}
+            """,
+        }
+        response = HTTP.post(
+            GITLAB_ENDPOINT, json=json_request, headers=gitlab_headers(), timeout=10
+        )
+        response.raise_for_status()
+        projects = response.json()["data"]["projects"]
+        for edge in projects["edges"]:
+            repositories[edge["node"]["fullPath"]] = edge["node"].get("lastActivityAt")
+        if not projects["pageInfo"]["hasNextPage"]:
+            break
+        cursor = projects["pageInfo"]["endCursor"]
     return repositories
 
+async def _gem_repositories():
+    github, gitlab = await asyncio.gather(
+        asyncio.to_thread(github_repositories), asyncio.to_thread(gitlab_repositories)
+    )
+    return {"github": github, "gitlab": gitlab}
+
 def gem_repositories():
-    """Return repositories grouped by provider."""
+    """Return repositories grouped by provider, with the time of their last activity."""
 
-    return {
-        "github": github_repositories(),
-        "gitlab": gitlab_repositories(),
-    }
+    return asyncio.run(_gem_repositories())
+
+def _has_activity(name_with_owner, last_seen, activity):
+    """Return whether a repository changed since its results were last complete."""
+
+    model = name_with_owner.rsplit("/", 1)[1]
+    return (
+        activity is None
+        or last_seen != activity
+        or not (RESULTS_DIR / f"{model}.json").exists()
+    )
 
-def matrix():
-    """Write a provider-keyed JSON index of repositories to disk."""
+def matrix(changed_only=False):
+    """Write the repository index and the repositories to validate to disk."""
 
+    try:
+        with open(ACTIVITY_FILE) as handle:
+            last_seen = json.load(handle)
+    except FileNotFoundError:
+        last_seen = {}
     with open("index.json", "r+") as handle:
         current = json.load(handle)
 
         discovered = gem_repositories()
+        activity = {}
+        scheduled = {}
         for provider in set(current) | set(discovered):
-            repos = set(current[provider])
-            repos.update(discovered[provider])
+            repos = set(current.get(provider, []))
+            repos.update(discovered.get(provider, {}))
             current[provider] = sorted(repos)
+            seen = last_seen.get(provider, {})
+            activity[provider] = {
+                repo: discovered.get(provider, {}).get(repo, seen.get(repo))
+                for repo in current[provider]
+            }
+            scheduled[provider] = [
+                repo for repo in current[provider]
+                if not changed_only
+                or _has_activity(repo, seen.get(repo), discovered.get(provider, {}).get(repo))
+            ]
 
         handle.seek(0)
         json.dump(current, handle, indent=2, sort_keys=True)
         handle.truncate()
+    for path, content in [(DISCOVERED_FILE, activity), (MATRIX_FILE, scheduled)]:
+        with open(path, "w") as handle:
+            json.dump(content, handle, indent=2, sort_keys=True)
+    total = sum(len(repos) for repos in scheduled.values())
+    print(f"Scheduled {total} of {sum(len(repos) for repos in activity.values())} repositories")
+    write_run_summary()
+    return scheduled
+
+def record_activity(models, discovered_file=None):
+    """Record the discovered activity of the repositories of *models*."""
+
+    discovered_file = Path(discovered_file or DISCOVERED_FILE)
+    if not discovered_file.exists():
+        return
+    with open(discovered_file) as handle:
+        discovered = json.load(handle)
+    try:
+        with open(ACTIVITY_FILE) as handle:
+            recorded = json.load(handle)
+    except FileNotFoundError:
+        recorded = {}
+    for provider, repos in discovered.items():
+        for name_with_owner, activity in repos.items():
+            if name_with_owner.rsplit("/", 1)[1] in models:
+                recorded.setdefault(provider, {})[name_with_owner] = activity
+    with open(ACTIVITY_FILE, "w") as handle:
+        json.dump(recorded, handle, indent=2, sort_keys=True)
+
+GITHUB_REPOSITORY_FIELDS = """
+    nameWithOwner
+    owner {
+        login
+        ... on Organization { avatarUrl name }
+        ... on User { avatarUrl name }
+    }
+    defaultBranchRef {
+        target {
+            ... on Commit {
+                committedDate
+                history { totalCount }
+            }
+        }
+    }
+"""
+
+def _avatar_filename(owner_name, avatar_url, existing_avatar):
+    """Return the cached avatar filename of an owner, downloading it if new."""
+
+    avatar_filename = existing_avatar
+    if not avatar_filename and avatar_url:
+        AVATARS_DIR.mkdir(exist_ok=True)
+        ext = Path(urlparse(avatar_url).path).suffix or ".png"
+        safe_owner = re.sub(r"[^A-Za-z0-9._-]", "_", owner_name or "avatar")
+        filename = f"{safe_owner}{ext}"
+        file_path = AVATARS_DIR / filename
+        if not file_path.exists():
+            img_resp = HTTP.get(avatar_url, timeout=10)
+            img_resp.raise_for_status()
+            with open(file_path, "wb") as img_file:
+                img_file.write(img_resp.content)
+        avatar_filename = filename
+    return avatar_filename
+
+def _github_contributors(owner, repo):
+    """Return the contributor count of a GitHub repository."""
+
+    contrib_url = (
+        f"{GITHUB_API_URL}/repos/{owner}/{repo}/contributors?per_page=1&anon=true"
+    )
+    contrib_response = HTTP.get(
+        contrib_url, headers=github_headers(), timeout=10
+    )
+    contrib_response.raise_for_status()
+    if "link" in contrib_response.headers:
+        match = re.search(
+            r"&page=(\d+)>; rel=\"last\"",
+            contrib_response.headers["link"],
+        )
+        if match:
+            return int(match.group(1))
+    return len(contrib_response.json())
+
+def _github_metadata(repo_data, existing_avatar):
+    """Return repository metadata from a GITHUB_REPOSITORY_FIELDS selection."""
+
+    owner, repo = repo_data["nameWithOwner"].rsplit("/", 1)
+    commit_data = repo_data["defaultBranchRef"]["target"]
+    owner_data = repo_data["owner"]
+    owner_name = owner_data.get("login")
+    return {
+        "commits": commit_data["history"]["totalCount"],
+        "contributors": _github_contributors(owner, repo),
+        "latest_commit_date": commit_data["committedDate"],
+        "owner": owner_name,
+        "avatar": _avatar_filename(
+            owner_name, owner_data.get("avatarUrl"), existing_avatar
+        ),
+    }
 
 def repository_metadata(name_with_owner, provider, existing_avatar):
     """Return metadata for a repository."""
@@ -140,79 +491,23 @@ def repository_metadata(name_with_owner, provider, existing_avatar):
             "query": f"""
             {{
                 repository(owner: \"{owner}\", name: \"{repo}\") {{
-                    owner {{
-                        login
-                        ... on Organization {{ avatarUrl name }}
-                        ... on User {{ avatarUrl name }}
-                    }}
-                    defaultBranchRef {{
-                        target {{
-                            ... on Commit {{
-                                committedDate
-                                history {{ totalCount }}
-                            }}
-                        }}
-                    }}
+                    {GITHUB_REPOSITORY_FIELDS}
                 }}
             }}
             """,
         }
-        response = requests.post(
-            GITHUB_ENDPOINT, json=json_request, headers=GITHUB_HEADERS, timeout=10
+        response = HTTP.post(
+            GITHUB_ENDPOINT, json=json_request, headers=github_headers(), timeout=10
         )
         response.raise_for_status()
         repo_data = response.json()["data"]["repository"]
-        commit_data = repo_data["defaultBranchRef"]["target"]
-        commit_count = commit_data["history"]["totalCount"]
-        latest_commit_date = commit_data["committedDate"]
-        owner_data = repo_data["owner"]
-        owner_name = owner_data.get("login")
-        avatar_url = owner_data.get("avatarUrl")
-        avatar_filename = existing_avatar
-        if not avatar_filename and avatar_url:
-            AVATARS_DIR.mkdir(exist_ok=True)
-            ext = Path(urlparse(avatar_url).path).suffix or ".png"
-            safe_owner = re.sub(r"[^A-Za-z0-9._-]", "_", owner_name or "avatar")
-            filename = f"{safe_owner}{ext}"
-            file_path = AVATARS_DIR / filename
-            if not file_path.exists():
-                img_resp = requests.get(avatar_url, timeout=10)
-                img_resp.raise_for_status()
-                with open(file_path, "wb") as img_file:
-                    img_file.write(img_resp.content)
-            avatar_filename = filename
-        contrib_url = (
-            f"https://api.github.com/repos/{owner}/{repo}/contributors?per_page=1&anon=true"
-        )
-        contrib_response = requests.get(
-            contrib_url, headers=GITHUB_HEADERS, timeout=10
-        )
-        contrib_response.raise_for_status()
-        if "link" in contrib_response.headers:
-            match = re.search(
-                r"&page=(\d+)>; rel=\"last\"",
-                contrib_response.headers["link"],
-            )
-            if match:
-                contributor_count = int(match.group(1))
-            else:
-                contributor_count = len(contrib_response.json())
-        else:
-            contributor_count = len(contrib_response.json())
-
-        return {
-            "commits": commit_count,
-            "contributors": contributor_count,
-            "latest_commit_date": latest_commit_date,
-            "owner": owner_name,
-            "avatar": avatar_filename,
-        }
+        return _github_metadata(repo_data, existing_avatar)
 
     elif provider == "gitlab":
         encoded = quote(name_with_owner, safe="")
-        headers = {"Private-Token": GITLAB_TOKEN}
-        project_response = requests.get(
-            f"https://gitlab.com/api/v4/projects/{encoded}",
+        headers = gitlab_headers(rest=True)
+        project_response = HTTP.get(
+            f"{GITLAB_URL}/api/v4/projects/{encoded}",
             headers=headers,
             timeout=10,
         )
@@ -224,22 +519,11 @@ def repository_metadata(name_with_owner, provider, existing_avatar):
             or namespace.get("name")
             or name_with_owner.split("/")[0]
         )
-        avatar_url = namespace.get("avatar_url")
-        avatar_filename = existing_avatar
-        if not avatar_filename and avatar_url:
-            AVATARS_DIR.mkdir(exist_ok=True)
-            ext = Path(urlparse(avatar_url).path).suffix or ".png"
-            safe_owner = re.sub(r"[^A-Za-z0-9._-]", "_", owner_name or "avatar")
-            filename = f"{safe_owner}{ext}"
-            file_path = AVATARS_DIR / filename
-            if not file_path.exists():
-                img_resp = requests.get(avatar_url, timeout=10)
-                img_resp.raise_for_status()
-                with open(file_path, "wb") as img_file:
-                    img_file.write(img_resp.content)
-            avatar_filename = filename
-        commits_response = requests.get(
-            f"https://gitlab.com/api/v4/projects/{project['id']}/repository/commits?per_page=1",
+        avatar_filename = _avatar_filename(
+            owner_name, namespace.get("avatar_url"), existing_avatar
+        )
+        commits_response = HTTP.get(
+            f"{GITLAB_URL}/api/v4/projects/{project['id']}/repository/commits?per_page=1",
             headers=headers,
             timeout=10,
         )
@@ -248,8 +532,8 @@ def repository_metadata(name_with_owner, provider, existing_avatar):
         latest_commit_date = commits[0]["committed_date"] if commits else None
         commit_count = int(commits_response.headers.get("X-Total", len(commits)))
 
-        contributors_response = requests.get(
-            f"https://gitlab.com/api/v4/projects/{project['id']}/repository/contributors",
+        contributors_response = HTTP.get(
+            f"{GITLAB_URL}/api/v4/projects/{project['id']}/repository/contributors",
             headers=headers,
             timeout=10,
         )
@@ -273,7 +557,6 @@ def releases(name_with_owner, provider):
     """Return release tags for a given repository."""
 
     owner, repo = name_with_owner.rsplit("/", 1)
-    releases_info = []
     if provider == "github":
         json_request = {
             "query": f"""
@@ -289,15 +572,12 @@ def releases(name_with_owner, provider):
             }} }}
             """,
         }
-        response = requests.post(
-            GITHUB_ENDPOINT, json=json_request, headers=GITHUB_HEADERS, timeout=10
+        response = HTTP.post(
+            GITHUB_ENDPOINT, json=json_request, headers=github_headers(), timeout=10
         )
         response.raise_for_status()
         data = response.json()["data"]["repository"]["releases"]["edges"]
-        releases_info = [
-            (edge["node"]["tagName"], edge["node"]["createdAt"])
-            for edge in data
-        ]
+        return _release_names(data, "createdAt")
     elif provider == "gitlab":
         json_request = {
             "query": f"""
@@ -308,79 +588,312 @@ def releases(name_with_owner, provider):
             }} }}
             """,
         }
-        response = requests.post(
-            GITLAB_ENDPOINT, json=json_request, headers=GITLAB_HEADERS, timeout=10
+        response = HTTP.post(
+            GITLAB_ENDPOINT, json=json_request, headers=gitlab_headers(), timeout=10
         )
         response.raise_for_status()
         data = response.json()["data"]["project"]["releases"]["edges"]
-        releases_info = [
-            (edge["node"]["tagName"], edge["node"]["releasedAt"])
-            for edge in data
-        ]
+        return _release_names(data, "releasedAt")
     else:
         raise ValueError(f"Unknown provider: {provider}")
+
+def _release_names(edges, date_field):
+    """Return the tag names of release edges, oldest first."""
+
+    releases_info = [
+        (edge["node"]["tagName"], edge["node"][date_field])
+        for edge in edges
+    ]
     releases_info.sort(key=lambda x: x[1] or "")
     release_names = [name for name, _ in releases_info]
     return release_names
 
-def gem_follows_standard(name_with_owner, release, version, provider):
-    """Check whether a repository follows the specified standard version."""
+@functools.lru_cache(maxsize=None)
+def standard_releases():
+    """Return the release tags of standard-GEM, fetched once per process."""
+
+    return releases(STANDARD_REPOSITORY, "github")
+
+def bulk_repository_data(repositories, provider, existing_avatars=None):
+    """Return metadata and release tags of many repositories in few requests."""
+
+    existing_avatars = existing_avatars or {}
+    collected = {}
+    for offset in range(0, len(repositories), GRAPHQL_BATCH):
+        batch = repositories[offset:offset + GRAPHQL_BATCH]
+        if provider == "github":
+            aliases = []
+            for index, name_with_owner in enumerate(batch):
+                owner, repo = name_with_owner.rsplit("/", 1)
+                aliases.append(f"""
+                r{index}: repository(owner: \"{owner}\", name: \"{repo}\") {{
+                    {GITHUB_REPOSITORY_FIELDS}
+                    releases(first: {RELEASES}) {{
+                        edges {{ node {{ tagName createdAt }} }}
+                    }}
+                }}""")
+            json_request = {"query": "{" + "".join(aliases) + "}"}
+            response = HTTP.post(
+                GITHUB_ENDPOINT, json=json_request, headers=github_headers(), timeout=10
+            )
+            response.raise_for_status()
+            data = response.json().get("data") or {}
+            for index, name_with_owner in enumerate(batch):
+                repo_data = data.get(f"r{index}")
+                if not repo_data:
+                    print(f"{name_with_owner}: not returned by GitHub")
+                    continue
+                collected[name_with_owner] = (
+                    _github_metadata(repo_data, existing_avatars.get(name_with_owner)),
+                    _release_names(repo_data["releases"]["edges"], "createdAt"),
+                )
+        elif provider == "gitlab":
+            json_request = {
+                "query": f"""
+                {{ projects(fullPaths: {json.dumps(batch)}, first: {len(batch)}) {{
+                    nodes {{
+                        fullPath
+                        releases(first: {RELEASES}) {{
+                            edges {{ node {{ tagName releasedAt }} }}
+                        }}
+                    }}
+                }} }}
+                """,
+            }
+            response = HTTP.post(
+                GITLAB_ENDPOINT, json=json_request, headers=gitlab_headers(), timeout=10
+            )
+            response.raise_for_status()
+            # GitLab may return the path in a different case than requested
+            requested = {name.lower(): name for name in batch}
+            for node in response.json()["data"]["projects"]["nodes"]:
+                name_with_owner = requested.get(node["fullPath"].lower())
+                if name_with_owner is None:
+                    continue
+                collected[name_with_owner] = (
+                    repository_metadata(
+                        name_with_owner, provider, existing_avatars.get(name_with_owner)
+                    ),
+                    _release_names(node["releases"]["edges"], "releasedAt"),
+                )
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+    return collected
+
+def normalize_standard(text):
+    """Return ``.standard-GEM.md`` text without checkboxes and trailing whitespace."""
+
+    text = re.sub(r"\[[ xX]\]", "", text)
+    return "\n".join(line.rstrip() for line in text.splitlines())
+
+
+def _standard_headings(lines):
+    """Return the Markdown heading each of *lines* falls under."""
+
+    heading = "(top)"
+    headings = []
+    for line in lines:
+        if line.startswith("#"):
+            heading = line.lstrip("#").strip()
+        headings.append(heading)
+    return headings
+
+
+def standard_diff(repo_text, standard_text):
+    """Return a line-level summary of how *repo_text* differs from the standard."""
+
+    standard_lines = normalize_standard(standard_text).split("\n")
+    repo_lines = normalize_standard(repo_text).split("\n")
+    standard_headings = _standard_headings(standard_lines)
+    repo_headings = _standard_headings(repo_lines)
+    matcher = difflib.SequenceMatcher(None, standard_lines, repo_lines, autojunk=False)
+    missing = extra = 0
+    sections = []
+    for operation, i1, i2, j1, j2 in matcher.get_opcodes():
+        if operation == "equal":
+            continue
+        missing += i2 - i1
+        extra += j2 - j1
+        # lines added between two lines of the standard belong to the section before
+        headings = standard_headings[i1:i2] + repo_headings[j1:j2]
+        for heading in headings or standard_headings[max(i1 - 1, 0):i1]:
+            if heading not in sections:
+                sections.append(heading)
+    return {"missing_lines": missing, "extra_lines": extra, "sections": sections}
+
+
+@functools.lru_cache(maxsize=None)
+def standard_specification(version):
+    """Return the normalized ``.standard-GEM.md`` of a standard version and its hash."""
+
+    key = f"github/{STANDARD_REPOSITORY}/{version}/{STANDARD_FILENAME}"
+    destination = CACHE_DIR / "standard" / version / STANDARD_FILENAME
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    sha256 = DOWNLOAD_CACHE.fetch(
+        f"{GITHUB_RAW_URL}/{STANDARD_REPOSITORY}/{version}/{STANDARD_FILENAME}",
+        key,
+        destination,
+        immutable=True,
+    )
+    if sha256 is None:
+        return None, None
+    text = normalize_standard(destination.read_text())
+    return text, hashlib.sha256(text.encode()).hexdigest()
+
+
+def repository_standard(name_with_owner, release, provider, directory=Path(".")):
+    """Return the ``.standard-GEM.md`` text of *release*, or ``None`` if absent."""
 
     if provider == "github":
-        repo_url = (
-            f"https://raw.githubusercontent.com/{name_with_owner}/{release}/.standard-GEM.md"
-        )
+        repo_url = f"{GITHUB_RAW_URL}/{name_with_owner}/{release}/{STANDARD_FILENAME}"
     elif provider == "gitlab":
-        repo_url = (
-            f"https://gitlab.com/{name_with_owner}/-/raw/{release}/.standard-GEM.md"
-        )
+        repo_url = f"{GITLAB_URL}/{name_with_owner}/-/raw/{release}/{STANDARD_FILENAME}"
     else:
         raise ValueError(f"Unknown provider: {provider}")
-    repo_standard = requests.get(repo_url, timeout=10)
-    if repo_standard.status_code == 404:
-        return False
-
-    standard_url = (
-        "https://raw.githubusercontent.com/MetabolicAtlas/standard-GEM/"
-        f"{version}/.standard-GEM.md"
+    destination = Path(directory) / STANDARD_FILENAME
+    sha256 = DOWNLOAD_CACHE.fetch(
+        repo_url,
+        f"{provider}/{name_with_owner}/{release}/{STANDARD_FILENAME}",
+        destination,
+        immutable=release not in ADDITIONAL_BRANCHES,
     )
-    standard_md = requests.get(standard_url, timeout=10)
-    if standard_md.status_code == 404:
-        return False
+    if sha256 is None:
+        destination.unlink(missing_ok=True)
+        return None
+    return destination.read_text()
+
+
+def compare_standard(repo_text, version):
+    """Return whether *repo_text* follows a standard version, and the diff if not."""
+
+    standard_text, standard_hash = standard_specification(version)
+    if standard_text is None or repo_text is None:
+        return False, None
+    repo_hash = hashlib.sha256(normalize_standard(repo_text).encode()).hexdigest()
+    if repo_hash == standard_hash:
+        return True, None
+    return False, standard_diff(repo_text, standard_text)
+
+
+def gem_follows_standard(name_with_owner, release, version, provider, repo_text=None):
+    """Check whether a repository follows the specified standard version."""
+
+    if repo_text is None:
+        repo_text = repository_standard(name_with_owner, release, provider)
+    return compare_standard(repo_text, version)[0]
+
+
+def model_loaders():
+    """Return the cobrapy loader for each model format."""
+
+    import cobra
+
+    return {
+        ".yml": cobra.io.load_yaml_model,
+        ".xml": cobra.io.read_sbml_model,
+        ".mat": load_matlab,
+        ".json": cobra.io.load_json_model,
+    }
+
+
+def load_matlab(path):
+    """Load a MAT-file with cobrapy after the header checks of :func:`matfile.precheck`."""
+
+    import cobra
+
+    info = precheck(path)
+    try:
+        return cobra.io.load_matlab_model(path)
+    except Exception as error:
+        problems = structure_problems(info) if info else None
+        if problems:
+            raise ValueError(f"{error} ({'; '.join(problems)})") from error
+        raise
+
+
+class ModelContext:
+    """Downloaded model files of one validation run, parsed at most once each."""
 
-    def strip_checkboxes(text):
-        """Remove Markdown checkboxes such as ``[ ]`` or ``[x]`` from *text*."""
-        return re.sub(r"\[[ xX]\]", "", text)
-    
-    repo_clean = strip_checkboxes(repo_standard.text)
-    standard_clean = strip_checkboxes(standard_md.text)
-    return repo_clean == standard_clean
+    def __init__(self, name, formats, directory=Path("."), hashes=None, previous=None):
+        self.name = name
+        self.formats = list(formats)
+        self.directory = Path(directory)
+        self.models = {}
+        self.load_times = {}
+        self.load_errors = {}
+        self.count_times = {}
+        self.hashes = dict(hashes or {})
+        # files identical to those of a previous context need no new parse
+        if previous is not None:
+            for model_format, parsed in previous.models.items():
+                digest = self.hashes.get(model_format)
+                if digest and digest == previous.hashes.get(model_format):
+                    self.models[model_format] = parsed
 
+    def path(self, model_format):
+        """Return the local path of the file in *model_format*."""
 
-def model_metrics(model, model_formats):
+        return self.directory / f"{self.name}{model_format}"
+
+    def file_hash(self, model_format):
+        """Return the SHA-256 of the file in *model_format*, or ``None`` if absent."""
+
+        if model_format not in self.hashes:
+            model_path = self.path(model_format)
+            if not model_path.is_file():
+                return None
+            digest = hashlib.sha256()
+            with open(model_path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(2**20), b""):
+                    digest.update(chunk)
+            self.hashes[model_format] = digest.hexdigest()
+        return self.hashes[model_format]
+
+    def load(self, model_format):
+        """Return the parsed cobra model, raising the error of a failed load."""
+
+        if model_format in self.models:
+            return self.models[model_format]
+        if model_format in self.load_errors:
+            raise self.load_errors[model_format]
+        model_path = self.path(model_format)
+        if not model_path.is_file():
+            raise FileNotFoundError(f"{model_path} was not downloaded")
+        loader = model_loaders()[model_format]
+        start = time.perf_counter()
+        try:
+            self.models[model_format] = loader(str(model_path))
+        except Exception as error:
+            self.load_errors[model_format] = error
+            raise
+        finally:
+            self.load_times[model_format] = time.perf_counter() - start
+        return self.models[model_format]
+
+
+def model_metrics(context, mode=None):
     """Return matching reaction and metabolite counts from all loadable files."""
 
+    if (mode or METRICS_MODE) == "stream":
+        paths = {model_format: context.path(model_format) for model_format in context.formats}
+        metrics, context.count_times = stream_metrics(paths)
+        return metrics
+
     metrics = None
     metrics_source = None
 
     try:
-        import cobra
+        model_loaders()
     except ImportError as error:
         print(f"Could not collect model metrics: {error}")
         return {"reactions": None, "metabolites": None}
 
-    loaders = {
-        ".yml": cobra.io.load_yaml_model,
-        ".xml": cobra.io.read_sbml_model,
-        ".mat": cobra.io.load_matlab_model,
-        ".json": cobra.io.load_json_model,
-    }
-    for model_format in model_formats:
-        model_path = Path(f"{model}{model_format}")
+    for model_format in context.formats:
+        model_path = context.path(model_format)
         if not model_path.is_file():
             continue
         try:
-            loaded_model = loaders[model_format](str(model_path))
+            loaded_model = context.load(model_format)
             format_metrics = {
                 "reactions": len(loaded_model.reactions),
                 "metabolites": len(loaded_model.metabolites),
@@ -402,54 +915,420 @@ def model_metrics(model, model_formats):
     return metrics or {"reactions": None, "metabolites": None}
 
 
-def run_validation(name_with_owner, tag, provider, standard_versions, model, data, filename):
-    validating_tag = {}
-    for version in standard_versions:
-        print(f"{name_with_owner}: {tag} | standard-GEM version: {version}")
-        gem_is_standard = gem_follows_standard(name_with_owner, tag, version, provider)
-        test_results = {}
-        downloaded_formats = []
-        for model_format in MODEL_FORMATS:
-            my_model = model + model_format
-            if provider == "github":
-                url = (
-                    f"https://raw.githubusercontent.com/{name_with_owner}/"
-                    f"{tag}/model/{my_model}"
-                )
-            else:
-                url = (
-                    f"https://gitlab.com/{name_with_owner}/-/raw/"
-                    f"{tag}/model/{my_model}"
-                )
-            response = requests.get(url, timeout=10)
-            if response.ok:
-                with open(my_model, "wb") as file:
-                    file.write(response.content)
-                downloaded_formats.append(model_format)
-        validating_tag["metrics"] = model_metrics(model, downloaded_formats)
-        for test in TESTS:
-            test_results.update(result_json_string(test, model))
+def download_model_files(
+    name_with_owner, tag, provider, model, directory=Path("."), profile=None, formats=None
+):
+    """Fetch the model files of *tag* into *directory* and return their SHA-256."""
+
+    hashes = {}
+    profile = {} if profile is None else profile
+    for model_format in MODEL_FORMATS if formats is None else formats:
+        my_model = model + model_format
+        if provider == "github":
+            url = (
+                f"{GITHUB_RAW_URL}/{name_with_owner}/"
+                f"{tag}/model/{my_model}"
+            )
+        else:
+            url = (
+                f"{GITLAB_URL}/{name_with_owner}/-/raw/"
+                f"{tag}/model/{my_model}"
+            )
+        destination = Path(directory) / my_model
+        with measure(profile.setdefault(model_format, {}), time.thread_time):
+            sha256 = DOWNLOAD_CACHE.fetch(
+                url,
+                f"{provider}/{name_with_owner}/{tag}/model/{my_model}",
+                destination,
+                immutable=tag not in ADDITIONAL_BRANCHES,
+            )
+        if sha256:
+            hashes[model_format] = sha256
+        else:
+            # never leave a file from a previously validated tag behind
+            destination.unlink(missing_ok=True)
+    return hashes
+
+
+def download_archive_files(
+    name_with_owner, tag, provider, model, directory=Path("."), formats=None
+):
+    """Fetch the model files and ``.standard-GEM.md`` of *tag* from one archive."""
+
+    wanted = {
+        f"model/{model}{model_format}": model_format
+        for model_format in (MODEL_FORMATS if formats is None else formats)
+    }
+    wanted[STANDARD_FILENAME] = None
+    keys = {path: f"{provider}/{name_with_owner}/{tag}/{path}" for path in wanted}
+    destinations = {path: Path(directory) / Path(path).name for path in wanted}
+    found = {}
+    if tag not in ADDITIONAL_BRANCHES:
+        try:
+            for path in wanted:
+                found[path] = DOWNLOAD_CACHE.get(keys[path], destinations[path])
+        except KeyError:
+            found = {}
+    if not found:
+        if provider == "github":
+            url = f"{GITHUB_API_URL}/repos/{name_with_owner}/tarball/{tag}"
+            headers = github_headers()
+        elif provider == "gitlab":
+            encoded = quote(name_with_owner, safe="")
+            url = f"{GITLAB_URL}/api/v4/projects/{encoded}/repository/archive.tar.gz?sha={tag}"
+            headers = gitlab_headers(rest=True)
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+        with HTTP.get(url, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    # members sit below a "<repository>-<commit>/" directory
+                    path = member.name.split("/", 1)[-1]
+                    if member.isfile() and path in wanted:
+                        found[path] = DOWNLOAD_CACHE.put(
+                            keys[path], archive.extractfile(member), destinations[path]
+                        )
+        for path in wanted:
+            if path not in found:
+                found[path] = DOWNLOAD_CACHE.put(keys[path], None, None)
+
+    hashes = {}
+    for path, model_format in wanted.items():
+        if not found[path]:
+            destinations[path].unlink(missing_ok=True)
+        elif model_format:
+            hashes[model_format] = found[path]
+    standard_path = destinations[STANDARD_FILENAME]
+    standard_text = standard_path.read_text() if standard_path.is_file() else None
+    return hashes, standard_text
+
+
+def suite_versions():
+    """Return the tool version of every test and a digest of the test code."""
+
+    versions = {}
+    for test in TESTS:
+        test_module, _, module_version = test_metadata(test)
+        versions[test_module] = module_version
+    digest = hashlib.sha256()
+    tests_dir = Path(__file__).resolve().parent / "tests"
+    for module_path in sorted(tests_dir.glob("*.py")):
+        digest.update(module_path.read_bytes())
+    versions["suite"] = digest.hexdigest()
+    return versions
+
+
+def validated_release(releases_data, hashes, versions):
+    """Return the tag and entry of an earlier validation of identical inputs."""
+
+    if not hashes:
+        return None
+    for release in releases_data:
+        for tag, entry in release.items():
+            if entry.get("hashes") == hashes and entry.get("versions") == versions:
+                return tag, entry
+    return None
+
+
+def fetch_release(name_with_owner, tag, provider, standard_versions, model, directory=Path(".")):
+    """Do the network part of validating *tag*: standard check and downloads."""
+
+    standard = {}
+    profile = {"downloads": {}, "standard_check": {}}
+    formats = required_formats(TESTS)
+    if FETCH_MODES.get(provider) == "archive":
+        with measure(profile["downloads"].setdefault("archive", {}), time.thread_time):
+            hashes, repo_text = download_archive_files(
+                name_with_owner, tag, provider, model, directory, formats
+            )
+    else:
+        hashes = download_model_files(
+            name_with_owner, tag, provider, model, directory, profile["downloads"], formats
+        )
+    with measure(profile["standard_check"], time.thread_time):
+        if FETCH_MODES.get(provider) != "archive":
+            repo_text = repository_standard(name_with_owner, tag, provider, directory)
+        for version in standard_versions:
+            print(f"{name_with_owner}: {tag} | standard-GEM version: {version}")
+            standard[version] = compare_standard(repo_text, version)
+    return standard, hashes, profile
+
+
+def evaluate_release(model, formats, directory=Path("."), context=None, reused=None):
+    """Do the CPU-bound part of validating a release, keeping *reused* metrics and results."""
+
+    context = context or ModelContext(model, formats, directory)
+    low_memory = MEMORY_MODE == "low"
+    kept = {}
+    profile = {}
+    if reused:
+        # the model files are unchanged, so only the tests that failed run again
+        metrics, kept, _ = reused
+    elif low_memory or RSS_BUDGET_MB:
+        metrics, profile["model_metrics"] = run_step(
+            model_metrics, context, "stream" if low_memory else None
+        )
+        metrics = metrics or {"reactions": None, "metabolites": None}
+        _, profile["model_index"] = run_step(build_model_index, context)
+    else:
+        # models parsed here are shared with the forked test workers
+        profile["model_metrics"] = {}
+        with measure(profile["model_metrics"]):
+            metrics = model_metrics(context)
+        profile["model_index"] = {}
+        with measure(profile["model_index"]):
+            build_model_index(context)
+    start = time.perf_counter()
+    tests = [test for test in TESTS if test_metadata(test)[0] not in kept]
+    test_results = run_tests(
+        tests, context, workers=1 if low_memory else None, max_rss_mb=test_rss_cap()
+    )
+    profile["tests"] = combine(result.get("profile") for result in test_results.values())
+    profile["tests"]["wall_seconds"] = round(time.perf_counter() - start, 3)
+    return metrics, {**kept, **test_results}, profile
+
+
+def build_model_index(context):
+    """Store the index of the first loadable format in *context*, if not stored yet."""
+
+    for model_format in INDEX_FORMATS:
+        sha256 = context.file_hash(model_format) if model_format in context.formats else None
+        if not sha256:
+            continue
+        if MODEL_INDEXES.get(model_format, sha256) is not None:
+            return model_format
+        try:
+            parsed = context.load(model_format)
+        except Exception:
+            continue
+        MODEL_INDEXES.put(model_format, sha256, model_index(parsed))
+        return model_format
+    return None
+
+
+def previous_release(releases_data, tag, release_tags=None):
+    """Return the tag and entry of the release validated before *tag*, or ``None``."""
+
+    start = 0
+    if release_tags and tag in release_tags:
+        start = _release_position(releases_data, tag, release_tags)
+    for entry in releases_data[start:]:
+        for other, content in entry.items():
+            if other != tag and other not in ADDITIONAL_BRANCHES:
+                return other, content
+    return None
+
+
+def release_delta(hashes, previous=None):
+    """Return how the model files *hashes* differ from a *previous* release."""
+
+    previous_tag, previous_entry = previous or (None, {})
+    previous_hashes = previous_entry.get("hashes") or {}
+    delta = None
+    for model_format in INDEX_FORMATS:
+        if model_format not in hashes:
+            continue
+        index = MODEL_INDEXES.get(model_format, hashes[model_format])
+        if index is None:
+            continue
+        delta = delta or {"digest": index["digest"], "against": None}
+        old = None
+        if model_format in previous_hashes:
+            old = MODEL_INDEXES.get(model_format, previous_hashes[model_format])
+        if old is not None:
+            delta = {"digest": index["digest"], "against": previous_tag}
+            delta.update(compare_indexes(old, index))
+            break
+    return delta
+
+
+def refresh_deltas(model, data, filename, release_tags=None):
+    """Recompute the deltas of the releases of *model* and store those that changed."""
+
+    releases_data = data[model]["releases"]
+    updated = []
+    for entry in list(releases_data):
+        (tag, validating_tag), = entry.items()
+        delta = release_delta(
+            validating_tag.get("hashes") or {},
+            previous_release(releases_data, tag, release_tags),
+        )
+        previous = validating_tag.get("delta")
+        # an index missing since then never undoes a comparison made before
+        if delta == previous or (
+            previous and previous["against"] and not (delta and delta["against"])
+        ):
+            continue
+        validating_tag["delta"] = delta
+        if delta is None:
+            del validating_tag["delta"]
+        position = _release_position(releases_data, tag, release_tags or [])
+        store_release(model, tag, validating_tag, data, filename, position, release_tags)
+        updated.append(tag)
+    return updated
+
+
+def test_rss_cap(budget_mb=None):
+    """Return the RSS cap of a test worker in MiB, 0 for none."""
+
+    budget_mb = RSS_BUDGET_MB if budget_mb is None else budget_mb
+    caps = [TEST_MAX_RSS_MB] if TEST_MAX_RSS_MB else []
+    if budget_mb:
+        caps.append(max(budget_mb - _process_rss(getpid()) / 2**20, 1))
+    return min(caps) if caps else 0
+
+
+def release_entry(
+    standard, hashes, versions, metrics, test_results, profile=None, delta=None
+):
+    """Return the result entry stored for one validated tag."""
+
+    validating_tag = {"hashes": hashes, "versions": versions, "metrics": metrics}
+    if delta:
+        validating_tag["delta"] = delta
+    if profile:
+        validating_tag["profile"] = profile
+        steps = list(profile.get("downloads", {}).values()) + [
+            profile.get(step)
+            for step in ("standard_check", "model_metrics", "model_index", "tests")
+        ]
+        validating_tag["peak_rss_mb"] = combine(steps)["peak_rss_mb"]
+    diffs = {version: diff for version, (_, diff) in standard.items() if diff}
+    if diffs:
+        validating_tag["standard-GEM-diff"] = diffs
+    for version, (gem_is_standard, _) in standard.items():
         validating_tag["standard-GEM"] = [
             {version: gem_is_standard},
             {"test_results": test_results},
         ]
-    # Always store the validated tag: update if present, otherwise prepend.
-    updated = False
-    for r in data[model]["releases"]:
+    return validating_tag
+
+
+def reusable_results(model, tag, data, hashes, versions):
+    """Return the metrics and clean test results of an identical earlier validation.
+
+    The last value is whether every test result is clean, so no test runs again.
+    """
+
+    validated = validated_release(data[model]["releases"], hashes, versions)
+    if not validated:
+        return None
+    previous_tag, previous = validated
+    test_results = previous["standard-GEM"][1]["test_results"]
+    clean = {key: entry for key, entry in test_results.items() if clean_result(entry)}
+    print(
+        f"{tag}: model files and tests unchanged since {previous_tag}, "
+        f"reusing {len(clean)} of {len(test_results)} results"
+    )
+    return previous["metrics"], clean, len(clean) == len(test_results)
+
+
+def _insert_release(releases_data, tag, validating_tag, position):
+    """Update the entry of *tag* if present, otherwise insert it at *position*."""
+
+    for r in releases_data:
         if tag in r:
             r.update({tag: validating_tag})
-            updated = True
-            break
-    if not updated:
-        data[model]["releases"] = [{tag: validating_tag}] + data[model]["releases"]
+            return
+    releases_data.insert(position, {tag: validating_tag})
+
+
+def write_shard(model, tag, validating_tag, metadata, release_tags=None):
+    """Write the entry of *tag* as a new shard file in ``SHARDS_DIR``."""
+
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    # a run may write the same tag again, such as when its delta is refreshed
+    run = str(time.time_ns())
+    if environ.get("GITHUB_RUN_ID"):
+        run = f"{environ['GITHUB_RUN_ID']}-{environ.get('GITHUB_RUN_ATTEMPT', '1')}-{run}"
+    safe_tag = re.sub(r"[^A-Za-z0-9._-]", "_", tag)
+    path = SHARDS_DIR / f"{model}--{safe_tag}--{run}.json"
+    shard = {
+        "model": model,
+        "tag": tag,
+        "entry": validating_tag,
+        "metadata": metadata,
+        "release_tags": release_tags,
+        "written": time.time(),
+    }
+    with open(path, "x") as output:
+        json.dump(shard, output, indent=2, sort_keys=True)
+    return path
+
+
+def store_release(model, tag, validating_tag, data, filename, position=0, release_tags=None):
+    """Add the entry of *tag* to *data* and write the result file or a shard."""
+
+    # Always store the validated tag: update if present, otherwise insert.
+    _insert_release(data[model]["releases"], tag, validating_tag, position)
+    if SHARDS_DIR:
+        write_shard(model, tag, validating_tag, data[model]["metadata"], release_tags)
+        return
     with open(filename, "w") as output:
         json.dump(data, output, indent=2, sort_keys=True)
 
 
-def validate(name_with_owner, provider):
-    """Validate a repository and write test results to disk."""
+def merge_results(shards_dir=None):
+    """Merge the result shards into the result files and remove the shards."""
+
+    shards_dir = Path(shards_dir or SHARDS_DIR or "shards")
+    shards = []
+    for path in sorted(shards_dir.glob("*.json")):
+        with open(path) as handle:
+            shards.append((json.load(handle), path))
+    shards.sort(key=lambda item: item[0]["written"])
+    merged = {}
+    release_tags = {}
+    for shard, path in shards:
+        model = shard["model"]
+        release_tags[model] = shard["release_tags"] or []
+        if model not in merged:
+            _, prev_releases = previous_results(model)
+            merged[model] = {model: {"metadata": {}, "releases": prev_releases}}
+        data = merged[model]
+        data[model]["metadata"] = shard["metadata"]
+        releases_data = data[model]["releases"]
+        position = _release_position(releases_data, shard["tag"], shard["release_tags"] or [])
+        _insert_release(releases_data, shard["tag"], shard["entry"], position)
+    RESULTS_DIR.mkdir(exist_ok=True)
+    for model, data in merged.items():
+        with open(RESULTS_DIR / f"{model}.json", "w") as output:
+            json.dump(data, output, indent=2, sort_keys=True)
+    for _, path in shards:
+        path.unlink()
+    record_activity({
+        model for model, data in merged.items()
+        if set(release_tags[model]) <= {tag for entry in data[model]["releases"] for tag in entry}
+    })
+    print(f"Merged {len(shards)} shards into {len(merged)} result files")
+    return sorted(merged)
+
+
+def run_validation(name_with_owner, tag, provider, standard_versions, model, data, filename):
+    standard, hashes, profile = fetch_release(
+        name_with_owner, tag, provider, standard_versions, model
+    )
+    versions = suite_versions()
+    reused = reusable_results(model, tag, data, hashes, versions)
+    if reused and reused[2]:
+        metrics, test_results, _ = reused
+    else:
+        metrics, test_results, evaluation = evaluate_release(
+            model, list(hashes), reused=reused
+        )
+        profile.update(evaluation)
+    delta = release_delta(hashes, previous_release(data[model]["releases"], tag))
+    validating_tag = release_entry(
+        standard, hashes, versions, metrics, test_results, profile, delta
+    )
+    store_release(model, tag, validating_tag, data, filename)
+
+
+def previous_results(model):
+    """Return the stored avatar and release entries of a model."""
 
-    owner, model = name_with_owner.rsplit("/", 1)
     filename = RESULTS_DIR / f"{model}.json"
     prev_avatar = None
     prev_releases = []
@@ -458,35 +1337,564 @@ def validate(name_with_owner, provider):
             previous = json.load(file)
             prev_avatar = previous[model].get("metadata", {}).get("avatar")
             prev_releases = previous[model].get("releases", [])
-    metadata = repository_metadata(name_with_owner, provider, prev_avatar)
+    return prev_avatar, prev_releases
+
+
+def release_plan(name_with_owner, provider, prefetched=None):
+    """Collect metadata and find the release tags without results."""
+
+    owner, model = name_with_owner.rsplit("/", 1)
+    filename = RESULTS_DIR / f"{model}.json"
+    prev_avatar, prev_releases = previous_results(model)
+    if prefetched:
+        metadata, newer_releases = prefetched
+    else:
+        metadata = repository_metadata(name_with_owner, provider, prev_avatar)
+        newer_releases = releases(name_with_owner, provider)
     data = {model: {"metadata": metadata, "releases": prev_releases}}
-    standard_versions = releases("MetabolicAtlas/standard-GEM", "github")[-1:]
-    to_validate = ""
-    newer_releases = releases(name_with_owner, provider)
     existing_tags = []
     for release in prev_releases:
         for k in release:
             existing_tags.append(k)
-    for model_release in newer_releases:
-        if model_release not in existing_tags:
-            print(f"{model_release} | {newer_releases} | {existing_tags}")
-            to_validate = model_release
-            break
+    missing = [tag for tag in newer_releases if tag not in existing_tags]
+    if missing:
+        print(f"{missing} | {newer_releases} | {existing_tags}")
+    return model, missing, newer_releases, data, filename
+
+
+def select_release(name_with_owner, provider, prefetched=None):
+    """Collect metadata and pick the tag to validate for a repository."""
+
+    model, missing, _, data, filename = release_plan(name_with_owner, provider, prefetched)
+    to_validate = missing[0] if missing else ADDITIONAL_BRANCHES[0]
+    return model, to_validate, data, filename
+
+
+def _release_position(releases_data, tag, release_tags):
+    """Return where to insert *tag* so that releases stay newest first."""
+
+    if tag not in release_tags:
+        return 0
+    index = release_tags.index(tag)
+    for position, entry in enumerate(releases_data):
+        if any(other in release_tags and release_tags.index(other) < index for other in entry):
+            return position
+    return len(releases_data)
 
-    if to_validate == "":
-        to_validate = ADDITIONAL_BRANCHES[0]
 
+def write_run_summary():
+    """Print the per-host HTTP counters and add them to the job summary."""
+
+    summary = HTTP.summary()
+    lines = [
+        "| Host | Requests | Retries | Errors | Mean latency (s) | Max latency (s) |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for host, stats in sorted(summary.items()):
+        lines.append(
+            f"| {host} | {stats['requests']} | {stats['retries']} | {stats['errors']} "
+            f"| {stats['mean_seconds']:.3f} | {stats['max_seconds']:.3f} |"
+        )
+    print("\n".join(lines))
+    if environ.get("GITHUB_STEP_SUMMARY"):
+        with open(environ["GITHUB_STEP_SUMMARY"], "a") as handle:
+            handle.write("### HTTP requests\n\n" + "\n".join(lines) + "\n")
+    return summary
+
+
+def validate(name_with_owner, provider):
+    """Validate a repository and write test results to disk."""
+
+    model, to_validate, data, filename = select_release(name_with_owner, provider)
+    standard_versions = standard_releases()[-1:]
     run_validation(name_with_owner, to_validate, provider, standard_versions, model, data, filename)
-    
-def result_json_string(test_to_run, model):
+    write_run_summary()
+
+
+def backfill(name_with_owner, provider, budget=None):
+    """Validate every release tag of a repository that has no results yet."""
+
+    budget = BACKFILL_BUDGET if budget is None else budget
+    start = time.monotonic()
+    model, missing, release_tags, data, filename = release_plan(name_with_owner, provider)
+    tags = list(reversed(missing)) or ADDITIONAL_BRANCHES[:1]
+    standard_versions = standard_releases()[-1:]
+    versions = suite_versions()
+    context = None
+    longest = 0.0
+    validated = []
+    for tag in tags:
+        # the rest is left for the next run once the next tag would likely
+        # overrun the budget, but at least one tag is always validated
+        if validated and budget and time.monotonic() - start + longest > budget:
+            print(f"{name_with_owner}: time budget spent, {len(tags) - len(validated)} tags left")
+            break
+        tag_start = time.monotonic()
+        standard, hashes, profile = fetch_release(
+            name_with_owner, tag, provider, standard_versions, model
+        )
+        reused = reusable_results(model, tag, data, hashes, versions)
+        if reused and reused[2]:
+            metrics, test_results, _ = reused
+        else:
+            context = ModelContext(model, list(hashes), hashes=hashes, previous=context)
+            metrics, test_results, evaluation = evaluate_release(
+                model, list(hashes), context=context, reused=reused
+            )
+            profile.update(evaluation)
+        validating_tag = release_entry(
+            standard, hashes, versions, metrics, test_results, profile
+        )
+        position = _release_position(data[model]["releases"], tag, release_tags)
+        store_release(model, tag, validating_tag, data, filename, position, release_tags)
+        validated.append(tag)
+        longest = max(longest, time.monotonic() - tag_start)
+    # tags are validated newest first, so their previous releases are only
+    # known once all of them are done
+    refresh_deltas(model, data, filename, release_tags)
+    write_run_summary()
+    return validated
+
+
+async def _validate_repository(name_with_owner, provider, standard_versions, limits, pool, prefetched):
+    """Validate one repository, doing network I/O in threads and tests in *pool*."""
+
+    directory = CACHE_DIR / "work" / name_with_owner
+    directory.mkdir(parents=True, exist_ok=True)
+    async with limits[provider]:
+        model, tag, data, filename = await asyncio.to_thread(
+            select_release, name_with_owner, provider, prefetched.get(name_with_owner)
+        )
+        standard, hashes, profile = await asyncio.to_thread(
+            fetch_release, name_with_owner, tag, provider, standard_versions, model, directory
+        )
+    versions = suite_versions()
+    reused = reusable_results(model, tag, data, hashes, versions)
+    if reused and reused[2]:
+        metrics, test_results, _ = reused
+    else:
+        loop = asyncio.get_running_loop()
+        metrics, test_results, evaluation = await loop.run_in_executor(
+            pool, evaluate_release, model, list(hashes), directory, None, reused
+        )
+        profile.update(evaluation)
+    delta = release_delta(hashes, previous_release(data[model]["releases"], tag))
+    validating_tag = release_entry(
+        standard, hashes, versions, metrics, test_results, profile, delta
+    )
+    store_release(model, tag, validating_tag, data, filename)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+async def _validate_all(index, workers, provider_limits):
+    standard_versions = await asyncio.to_thread(standard_releases)
+    limits = {
+        provider: asyncio.Semaphore(limit) for provider, limit in provider_limits.items()
+    }
+    lookups = [
+        asyncio.to_thread(
+            bulk_repository_data,
+            repositories,
+            provider,
+            {
+                name_with_owner: previous_results(name_with_owner.rsplit("/", 1)[1])[0]
+                for name_with_owner in repositories
+            },
+        )
+        for provider, repositories in index.items()
+    ]
+    prefetched = {}
+    for provider, outcome in zip(index, await asyncio.gather(*lookups, return_exceptions=True)):
+        # repositories missing here are looked up one by one
+        if isinstance(outcome, Exception):
+            print(f"Bulk {provider} lookup failed: {outcome!r}")
+        else:
+            prefetched.update(outcome)
+    # forkserver keeps the pool clear of the locks held by the I/O threads
+    mp_context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        jobs = [
+            _validate_repository(
+                name_with_owner, provider, standard_versions[-1:], limits, pool, prefetched
+            )
+            for provider, repositories in index.items()
+            for name_with_owner in repositories
+        ]
+        outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+    failures = {}
+    repositories = [repo for repos in index.values() for repo in repos]
+    for name_with_owner, outcome in zip(repositories, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"{name_with_owner}: validation failed: {outcome!r}")
+            failures[name_with_owner] = outcome
+    return failures
+
+
+def validate_all(index_file="index.json", workers=None, provider_limits=None):
+    """Validate every repository listed in *index_file* in a single process."""
+
+    with open(index_file) as handle:
+        index = json.load(handle)
+    limits = dict(PROVIDER_CONCURRENCY)
+    limits.update(provider_limits or {})
+    failures = asyncio.run(_validate_all(index, workers or BATCH_WORKERS, limits))
+    write_run_summary()
+    return failures
+
+
+def result_json_string(test_to_run, context):
     """Return a JSON-serialisable dictionary with test results."""
 
-    test_module, description, module_version, status, errors = test_to_run(model)
+    profile = {}
+    profiler = cProfile.Profile() if PROFILE_DIR else None
+    with measure(profile):
+        if profiler:
+            outcome = profiler.runcall(test_to_run, context)
+        else:
+            outcome = test_to_run(context)
+    test_module, description, module_version, status, errors = outcome
+    if profiler:
+        dump_dir = Path(PROFILE_DIR) / context.name
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(dump_dir / f"{test_module}.pstats")
     return {
         test_module: {
             "description": description,
             "version": module_version,
             "status": status,
             "errors": errors[:300],
+            "profile": profile,
         }
     }
+
+def test_metadata(test_to_run):
+    """Return the result key, description and tool version a test declares."""
+
+    test_module = getattr(test_to_run, "key", None) or test_to_run.__name__
+    module_version = ""
+    if getattr(test_to_run, "tool", None):
+        try:
+            module_version = import_module(test_to_run.tool).__version__
+        except Exception:
+            pass
+    description = ""
+    try:
+        function = getattr(test_to_run, "function", test_to_run)
+        tree = ast.parse(textwrap.dedent(inspect.getsource(function)))
+    except Exception:
+        return test_module, description, module_version
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant)
+            and any(getattr(target, "id", None) == "description" for target in node.targets)
+        ):
+            description = node.value.value
+    return test_module, description, module_version
+
+def failed_result(test_to_run, errors, profile=None):
+    """Return a failed result entry for a test that did not finish."""
+
+    test_module, description, module_version = test_metadata(test_to_run)
+    result = {
+        "description": description,
+        "version": module_version,
+        "status": False,
+        "errors": errors,
+    }
+    if profile:
+        result["profile"] = profile
+    return {test_module: result}
+
+def result_cache_key(test_to_run, context):
+    """Return the result cache key and result key of a test on *context*."""
+
+    test_module, _, module_version = test_metadata(test_to_run)
+    try:
+        function = getattr(test_to_run, "function", test_to_run)
+    except Exception:
+        # the import error is recorded as the result when the test runs
+        return None
+    try:
+        cobra_version = metadata.version("cobra")
+    except metadata.PackageNotFoundError:
+        cobra_version = None
+    formats = getattr(test_to_run, "formats", None) or context.formats
+    material = {
+        "test": test_module,
+        "version": str(module_version),
+        "cobra": cobra_version,
+        "source": hashlib.sha256(Path(inspect.getsourcefile(function)).read_bytes()).hexdigest(),
+        "inputs": {model_format: context.file_hash(model_format) for model_format in formats},
+    }
+    key = hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+    return key, test_module, module_version
+
+def _cached_results(tests, context):
+    """Split *tests* into cached results and the cache keys of the tests to run."""
+
+    cached = {}
+    to_run = {}
+    for test in tests:
+        cache_key = result_cache_key(test, context)
+        result = RESULT_CACHE.get(cache_key[0]) if cache_key else None
+        if result is None:
+            to_run[test] = cache_key
+        else:
+            print(f"{test.__name__}: inputs and tools unchanged, reusing cached result")
+            for entry in result.values():
+                entry["cached"] = True
+            cached.update(result)
+    return cached, to_run
+
+def clean_result(entry):
+    """Return whether a test result entry passed without errors."""
+
+    # a failure may be transient, such as a solver licence error
+    return entry.get("status") is not False and not entry.get("errors")
+
+def _store_result(cache_keys, test, result):
+    """Add the result of a finished test to the result cache if it is clean."""
+
+    if all(clean_result(entry) for entry in result.values()) and cache_keys.get(test):
+        key, test_module, module_version = cache_keys[test]
+        RESULT_CACHE.put(key, test_module, module_version, result)
+
+def _process_rss(pid):
+    """Return the resident set size of a process in bytes, 0 if unknown."""
+
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _process_pss(pid):
+    """Return the proportional set size of a process in bytes, its RSS if unknown."""
+
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            for line in rollup:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return _process_rss(pid)
+
+def _process_tree(pid):
+    """Return a process and all its descendants, the process first."""
+
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            parent = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(stat.parent.name))
+    tree = [pid]
+    for current in tree:
+        tree.extend(children.get(current, []))
+    return tree
+
+def _tree_memory(pid):
+    """Return the summed proportional set size of a process and its descendants."""
+
+    # pages shared after a fork, such as a model parsed before Memote
+    # shards start, count once in the proportional set sizes
+    return sum(_process_pss(process) for process in _process_tree(pid))
+
+def _worker(function, args, connection):
+    """Run *function* in a worker process and send its return value to the parent."""
+
+    connection.send(function(*args))
+    connection.close()
+
+def _supervise(jobs, workers, timeout, max_rss_mb):
+    """Run *jobs* in forked workers within the limits and yield their outcomes."""
+
+    mp_context = multiprocessing.get_context("fork")
+    pending = list(jobs)
+    running = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            key, function, args = pending.pop(0)
+            receiver, sender = mp_context.Pipe(duplex=False)
+            process = mp_context.Process(target=_worker, args=(function, args, sender))
+            process.start()
+            sender.close()
+            running[process] = (key, receiver, time.monotonic(), 0)
+
+        for process, (key, receiver, started, peak) in list(running.items()):
+            value = error = None
+            memory = _tree_memory(process.pid)
+            peak = max(peak, memory)
+            # a worker may send its result and exit between two checks
+            alive = process.is_alive()
+            if receiver.poll():
+                try:
+                    value = receiver.recv()
+                except EOFError:
+                    process.join()
+                    error = f"worker exited with code {process.exitcode}"
+            elif not alive:
+                # a SIGKILL nobody asked for is the kernel OOM killer
+                if process.exitcode == -signal.SIGKILL:
+                    error = "oom"
+                else:
+                    error = f"worker exited with code {process.exitcode}"
+            elif time.monotonic() - started > timeout:
+                error = "timeout"
+            elif max_rss_mb and memory > max_rss_mb * 2**20:
+                error = "oom"
+            else:
+                running[process] = (key, receiver, started, peak)
+                continue
+            if not error:
+                process.join(10)
+            if process.is_alive():
+                # the processes the worker started would outlive it
+                for descendant in _process_tree(process.pid)[1:]:
+                    try:
+                        kill(descendant, signal.SIGKILL)
+                    except OSError:
+                        pass
+                process.kill()
+                process.join()
+            receiver.close()
+            del running[process]
+            profile = {
+                "wall_seconds": round(time.monotonic() - started, 3),
+                "peak_rss_mb": round(peak / 2**20, 1) if peak else None,
+            }
+            yield key, value, error, profile
+        time.sleep(0.1)
+
+def _measured_step(function, args):
+    """Return the value of *function* and its profile, or the exception it raised."""
+
+    profile = {}
+    try:
+        with measure(profile):
+            value = function(*args)
+    except Exception as error:
+        return None, error, profile
+    return value, None, profile
+
+def run_step(function, *args, timeout=None, max_rss_mb=None):
+    """Run a validation step in a worker with the limits of a test worker."""
+
+    timeout = TEST_TIMEOUT if timeout is None else timeout
+    max_rss_mb = test_rss_cap() if max_rss_mb is None else max_rss_mb
+    jobs = [(function.__name__, _measured_step, (function, args))]
+    for name, outcome, error, sampled in _supervise(jobs, 1, timeout, max_rss_mb):
+        if error:
+            print(f"{name}: {error}")
+            sampled.update({"cpu_seconds": None, "error": error})
+            return None, sampled
+        value, raised, profile = outcome
+        if raised:
+            raise raised
+        # the sampled peak covers the processes the step started
+        peaks = [peak for peak in (profile["peak_rss_mb"], sampled["peak_rss_mb"]) if peak]
+        profile["peak_rss_mb"] = max(peaks) if peaks else None
+        return value, profile
+
+def _test_result(test_to_run, context):
+    """Return the result entry of one test, a failed one if it raised."""
+
+    try:
+        return result_json_string(test_to_run, context)
+    except Exception as error:
+        return failed_result(test_to_run, json.dumps(str(error))[:300])
+
+def run_tests(tests, context, workers=None, timeout=None, max_rss_mb=None):
+    """Run *tests* in parallel worker processes and return the merged results."""
+
+    workers = TEST_WORKERS if workers is None else workers
+    timeout = TEST_TIMEOUT if timeout is None else timeout
+    max_rss_mb = TEST_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    test_results = {}
+    available = [
+        model_format for model_format in context.formats if context.path(model_format).is_file()
+    ]
+    tests, skipped = plan_tests(tests, available)
+    for test in skipped:
+        test_results.update(failed_result(test, "File missing"))
+    cache_keys = {}
+    if RESULT_CACHE:
+        cached, cache_keys = _cached_results(tests, context)
+        test_results.update(cached)
+        tests = list(cache_keys)
+    if workers < 1:
+        for test in tests:
+            result = result_json_string(test, context)
+            _store_result(cache_keys, test, result)
+            test_results.update(result)
+        return test_results
+
+    jobs = [(test, _test_result, (test, context)) for test in tests]
+    for test, result, error, sampled in _supervise(jobs, workers, timeout, max_rss_mb):
+        if error:
+            print(f"{test.__name__}: {error}")
+            # a killed worker cannot report its CPU time
+            sampled["cpu_seconds"] = None
+            test_results.update(failed_result(test, error, sampled))
+            continue
+        for entry in result.values():
+            # the sampled peak covers the processes the test started
+            if entry.get("profile") and sampled["peak_rss_mb"]:
+                entry["profile"]["peak_rss_mb"] = max(
+                    entry["profile"]["peak_rss_mb"] or 0, sampled["peak_rss_mb"]
+                )
+        _store_result(cache_keys, test, result)
+        test_results.update(result)
+    return test_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    batch = subcommands.add_parser(
+        "validate-all", help="validate every repository listed in the index"
+    )
+    batch.add_argument("--index", default="index.json")
+    batch.add_argument("--workers", type=int, help="repositories evaluated at once")
+    for provider in PROVIDER_CONCURRENCY:
+        batch.add_argument(
+            f"--{provider}", type=int, dest=provider,
+            help=f"concurrent {provider} repositories during network I/O",
+        )
+    clear = subcommands.add_parser(
+        "clear-result-cache", help="remove cached test results"
+    )
+    clear.add_argument("--test", help="result key of the test, all tests when omitted")
+    merging = subcommands.add_parser(
+        "merge-results", help="merge result shards into the result files"
+    )
+    merging.add_argument("--shards", help="shard directory, GEM_SHARDS_DIR or shards by default")
+    backfilling = subcommands.add_parser(
+        "backfill", help="validate every release of a repository without results"
+    )
+    backfilling.add_argument("name_with_owner")
+    backfilling.add_argument("--provider", default="github", choices=list(PROVIDER_CONCURRENCY))
+    backfilling.add_argument("--budget", type=float, help="seconds to spend, 0 for no limit")
+    args = parser.parse_args()
+    if args.command == "validate-all":
+        limits = {
+            provider: getattr(args, provider)
+            for provider in PROVIDER_CONCURRENCY
+            if getattr(args, provider)
+        }
+        failed = validate_all(args.index, args.workers, limits)
+        raise SystemExit(1 if failed else 0)
+    elif args.command == "clear-result-cache":
+        if RESULT_CACHE:
+            removed = RESULT_CACHE.invalidate(args.test)
+            print(f"Removed {removed} cached results")
+    elif args.command == "merge-results":
+        merge_results(args.shards)
+    elif args.command == "backfill":
+        backfill(args.name_with_owner, args.provider, args.budget)
@@ -0,0 +1,188 @@
+"""Compact exports of the result files for the results dashboard.
+
+``summary.json`` holds what the overview table needs for every model: the
+latest validated release, its test outcomes as bitmaps, its Memote score and
+its metrics. ``history.json`` holds every validated release in columns, one
+list per field and model, with the test descriptions stored once, so trends
+such as the Memote score over releases are read from a single small file.
+Both are written without indentation.
+
+Run from the repository root::
+
+    python summary.py --output pages-source
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+RESULTS_DIR = Path("results")
+MEMOTE_TEST = "memote-score"
+COMPACT = {"separators": (",", ":"), "sort_keys": True}
+
+
+def load_results(results_dir=RESULTS_DIR):
+    """Return the metadata and release entries of every result file by model."""
+
+    models = {}
+    for path in sorted(Path(results_dir).glob("*.json")):
+        with open(path) as handle:
+            data = json.load(handle)
+        for model, content in data.items():
+            models[model] = content
+    return models
+
+
+def _release(entry):
+    """Return the standard version, standard status and test results of an entry."""
+
+    standard = entry.get("standard-GEM") or [{}]
+    version, is_standard = next(iter(standard[0].items()), (None, None))
+    test_results = standard[1].get("test_results", {}) if len(standard) > 1 else {}
+    return version, is_standard, test_results
+
+
+def _passed(result):
+    """Return whether a test result counts as passed.
+
+    A test passes when its status is ``True``, or a number reported without
+    errors, like the Memote score.
+    """
+
+    status = result.get("status")
+    if isinstance(status, bool):
+        return status
+    return isinstance(status, (int, float)) and not result.get("errors")
+
+
+def _score(test_results):
+    status = test_results.get(MEMOTE_TEST, {}).get("status")
+    if isinstance(status, bool) or not isinstance(status, (int, float)):
+        return None
+    return status
+
+
+def test_names(models):
+    """Return the sorted names of all tests found in the results."""
+
+    names = set()
+    for content in models.values():
+        for release in content.get("releases", []):
+            for entry in release.values():
+                names.update(_release(entry)[2])
+    return sorted(names)
+
+
+def build_summary(models):
+    """Return the overview of the latest validated release of every model.
+
+    Bit *i* of ``ran`` is set when test ``tests[i]`` has a result and bit *i*
+    of ``passed`` when that result passed.
+    """
+
+    tests = test_names(models)
+    summary = {}
+    for model, content in models.items():
+        releases = content.get("releases", [])
+        if not releases:
+            continue
+        (tag, entry), = releases[0].items()
+        version, is_standard, test_results = _release(entry)
+        ran = passed = 0
+        for bit, name in enumerate(tests):
+            if name in test_results:
+                ran |= 1 << bit
+                if _passed(test_results[name]):
+                    passed |= 1 << bit
+        summary[model] = {
+            "metadata": content.get("metadata", {}),
+            "release": tag,
+            "releases": len(releases),
+            "standard": {"version": version, "valid": is_standard},
+            "ran": ran,
+            "passed": passed,
+            "memote_score": _score(test_results),
+            "metrics": entry.get("metrics"),
+        }
+    return {"tests": tests, "models": summary}
+
+
+def build_history(models):
+    """Return every validated release of every model in columns.
+
+    Each model has one list per field with an item per release, oldest first.
+    A test column holds the status, the tool version and the index of the
+    description in ``descriptions``, or ``None`` where the test did not run.
+    Errors are left out; they stay in the result files.
+    """
+
+    tests = test_names(models)
+    descriptions = []
+    description_index = {}
+    history = {}
+    for model, content in models.items():
+        columns = {
+            "tags": [],
+            "standard_version": [],
+            "standard": [],
+            "reactions": [],
+            "metabolites": [],
+            "memote_score": [],
+            "tests": {
+                name: {"status": [], "version": [], "description": []} for name in tests
+            },
+        }
+        for release in reversed(content.get("releases", [])):
+            (tag, entry), = release.items()
+            version, is_standard, test_results = _release(entry)
+            metrics = entry.get("metrics") or {}
+            columns["tags"].append(tag)
+            columns["standard_version"].append(version)
+            columns["standard"].append(is_standard)
+            columns["reactions"].append(metrics.get("reactions"))
+            columns["metabolites"].append(metrics.get("metabolites"))
+            columns["memote_score"].append(_score(test_results))
+            for name, column in columns["tests"].items():
+                result = test_results.get(name)
+                if result is None:
+                    column["status"].append(None)
+                    column["version"].append(None)
+                    column["description"].append(None)
+                    continue
+                description = result.get("description", "")
+                if description not in description_index:
+                    description_index[description] = len(descriptions)
+                    descriptions.append(description)
+                column["status"].append(result.get("status"))
+                column["version"].append(result.get("version"))
+                column["description"].append(description_index[description])
+        history[model] = columns
+    return {"tests": tests, "descriptions": descriptions, "models": history}
+
+
+def write_exports(results_dir=RESULTS_DIR, output_dir=Path(".")):
+    """Write ``summary.json`` and ``history.json`` and return their paths."""
+
+    models = load_results(results_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, content in [
+        ("summary.json", build_summary(models)),
+        ("history.json", build_history(models)),
+    ]:
+        path = output_dir / name
+        with open(path, "w") as handle:
+            json.dump(content, handle, **COMPACT)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--output", type=Path, default=Path("."))
+    args = parser.parse_args()
+    for path in write_exports(args.results, args.output):
+        print(f"Wrote {path}")
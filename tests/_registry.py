@@ -0,0 +1,26 @@
+"""Declarations read by the runner's test registry."""
+
+COSTS = ("cheap", "expensive")
+
+
+def check(*formats, cost="cheap", key=None, tool=None):
+    """Declare the model formats a check reads, its cost class, result key and tool.
+
+    The runner reads the arguments from the source without importing the
+    module: it downloads only the formats that enabled checks declare, skips a
+    check whose formats are missing and runs cheap checks before expensive
+    ones. *key* is the result key the check returns and *tool* the module
+    whose ``__version__`` it reports. Arguments must therefore be literals.
+    """
+
+    if cost not in COSTS:
+        raise ValueError(f"Unknown cost class: {cost}")
+
+    def register(function):
+        function.formats = formats
+        function.cost = cost
+        function.key = key
+        function.tool = tool
+        return function
+
+    return register
@@ -1,14 +1,15 @@
 import cobra
 import json
-from pathlib import Path
+from tests._registry import check
 
-def loadYaml(model_name):
+@check('.yml', key='cobrapy-load-yaml', tool='cobra')
+def loadYaml(context):
     description = 'Check if the model in YAML can be loaded with cobrapy.'
     print(description)
     status = False
     errors = ''
     try:
-        cobra.io.load_yaml_model(model_name + '.yml')
+        context.load('.yml')
         status = True
     except FileNotFoundError:
         errors = "File missing"
@@ -17,13 +18,14 @@ def loadYaml(model_name):
         print(e)
     return 'cobrapy-load-yaml',  description, cobra.__version__, status, errors
 
-def loadSbml(model_name):
+@check('.xml', key='cobrapy-load-sbml', tool='cobra')
+def loadSbml(context):
     description = 'Check if the model in SBML format can be loaded with cobrapy.'
     print(description)
     status = False
     errors = ''
     try:
-        cobra.io.read_sbml_model(model_name + '.xml')
+        context.load('.xml')
         status = True
     except FileNotFoundError:
         errors = "File missing"
@@ -32,16 +34,14 @@ def loadSbml(model_name):
         print(e)
     return 'cobrapy-load-sbml', description, cobra.__version__, status, errors
 
-def loadMatlab(model_name):
+@check('.mat', key='cobrapy-load-matlab', tool='cobra')
+def loadMatlab(context):
     description = 'Check if the model in Matlab format can be loaded with cobrapy.'
     print(description)
     status = False
     errors = ''
     try:
-        data_dir = Path(".") / ".." 
-        data_dir = data_dir.resolve()
-        model_path = data_dir / "{}.mat".format(model_name)
-        cobra.io.load_matlab_model(str(model_path.resolve()))
+        context.load('.mat')
         status = True
     except FileNotFoundError:
         errors = "File missing"
@@ -50,13 +50,14 @@ def loadMatlab(model_name):
         print(e)
     return 'cobrapy-load-matlab', description, cobra.__version__, status, errors
 
-def loadJson(model_name):
+@check('.json', key='cobrapy-load-json', tool='cobra')
+def loadJson(context):
     description = 'Check if the model in JSON format can be loaded with cobrapy.'
     print(description)
     status = False
     errors = ''
     try:
-        cobra.io.load_json_model(model_name + '.json')
+        context.load('.json')
         status = True
     except FileNotFoundError:
         errors = "File missing"
@@ -66,13 +67,14 @@ def loadJson(model_name):
     return 'cobrapy-load-json', description, cobra.__version__, status, errors
 
 
-def validateSbml(model_name):
+@check('.xml', key='cobrapy-validate-sbml', tool='cobra')
+def validateSbml(context):
     description = 'Check with cobrapy if the model in SBML format is valid.'
     print(description)
     status = False
     errors = ''
     try:
-        _, result = cobra.io.sbml.validate_sbml_model(model_name + '.xml')
+        _, result = cobra.io.sbml.validate_sbml_model(str(context.path('.xml')))
         if result['SBML_FATAL'] == [] and result['SBML_ERROR'] == [] and result['SBML_SCHEMA_ERROR'] == [] and result['COBRA_FATAL'] == [] and result['COBRA_ERROR'] == []:
             status = True
         else:
@@ -1,15 +1,144 @@
-import cobra
 import json
+import multiprocessing
+import os
+import tempfile
+from os import environ
+from pathlib import Path
+
 import memote
+from memote.suite.results import MemoteResult
+from tests._registry import check
+
+MEMOTE_TESTS = [
+    'test_stoichiometric_consistency',
+    'test_reaction_mass_balance',
+    'test_reaction_charge_balance',
+    'test_find_disconnected',
+    'test_find_reactions_unbounded_flux_default_condition',
+    'test_metabolite_annotation_presence',
+    'test_metabolite_annotation_overview',
+    'test_metabolite_annotation_wrong_ids',
+    'test_metabolite_id_namespace_consistency',
+    'test_reaction_annotation_presence',
+    'test_reaction_annotation_overview',
+    'test_reaction_annotation_wrong_ids',
+    'test_reaction_id_namespace_consistency',
+    'test_gene_product_annotation_presence',
+    'test_gene_product_annotation_overview',
+    'test_gene_product_annotation_wrong_ids',
+    'test_model_id_presence',
+    'test_metabolites_presence',
+    'test_reactions_presence',
+    'test_genes_presence',
+    'test_compartments_presence',
+    'test_metabolic_coverage',
+    'test_unconserved_metabolites',
+    'test_inconsistent_min_stoichiometry',
+    'test_find_unique_metabolites',
+    'test_find_duplicate_metabolites_in_compartments',
+    'test_metabolites_charge_presence',
+    'test_metabolites_formula_presence',
+    'test_find_medium_metabolites',
+    'test_find_pure_metabolic_reactions',
+    'test_find_constrained_pure_metabolic_reactions',
+    'test_find_transport_reactions',
+    'test_find_constrained_transport_reactions',
+    'test_find_candidate_irreversible_reactions',
+    'test_find_reactions_with_partially_identical_annotations',
+    'test_find_duplicate_reactions',
+    'test_find_reactions_with_identical_genes',
+]
+# Processes the Memote tests are split across, 1 runs them in one go
+SHARDS = int(environ.get('MEMOTE_SHARDS', '1'))
+# Durations of the Memote tests in earlier runs, used to balance the shards
+DURATIONS_FILE = Path(environ.get('GEM_CACHE_DIR', '.cache')) / 'memote-durations.json'
+
+_shard_model = None
+
+def _load_durations():
+    try:
+        with open(DURATIONS_FILE) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+def _save_durations(results):
+    durations = _load_durations()
+    for name in MEMOTE_TESTS:
+        duration = results['tests'].get(name, {}).get('duration')
+        # parametrized tests report one duration per parameter
+        if isinstance(duration, dict):
+            duration = sum(duration.values())
+        if duration is not None:
+            durations[name] = duration
+    try:
+        DURATIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=DURATIONS_FILE.parent, delete=False) as handle:
+            json.dump(durations, handle)
+        os.replace(handle.name, DURATIONS_FILE)
+    except OSError:
+        pass
+
+def _shards(tests, count, durations):
+    """Split *tests* into *count* shards of similar expected duration.
+
+    Tests are assigned longest first to the shard with the least work so far;
+    tests without an earlier duration count as the mean of the known ones.
+    """
+    known = [durations[name] for name in tests if name in durations]
+    default = sum(known) / len(known) if known else 1.0
+    shards = [[] for _ in range(min(count, len(tests)))]
+    loads = [0.0] * len(shards)
+    for name in sorted(tests, key=lambda name: durations.get(name, default), reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(name)
+        loads[index] += durations.get(name, default)
+    return shards
+
+def _run_shard(tests):
+    # the model was parsed before the fork, each worker tests its own copy
+    _, results = memote.suite.api.test_model(model=_shard_model, results=True, exclusive=tests)
+    return dict(results)
+
+def _merge(shard_results, shards):
+    """Merge shard results into the result of a single run.
+
+    Every test case is taken from the shard that ran it; cases that no shard
+    ran were skipped alike by all of them.
+    """
+    merged = MemoteResult(meta=shard_results[0]['meta'])
+    owner = {name: index for index, tests in enumerate(shards) for name in tests}
+    for name, case in shard_results[0]['tests'].items():
+        merged.cases[name] = shard_results[owner.get(name, 0)]['tests'].get(name, case)
+    return merged
+
+def _test_model(model, shards=1):
+    """Run the selected Memote tests on *model*, in *shards* processes if above 1."""
+    global _shard_model
+    if shards <= 1:
+        _, results = memote.suite.api.test_model(model=model, results=True, exclusive=MEMOTE_TESTS)
+    else:
+        test_shards = _shards(MEMOTE_TESTS, shards, _load_durations())
+        _shard_model = model
+        try:
+            with multiprocessing.get_context('fork').Pool(len(test_shards)) as pool:
+                shard_results = pool.map(_run_shard, test_shards, chunksize=1)
+        finally:
+            _shard_model = None
+        results = _merge(shard_results, test_shards)
+    _save_durations(results)
+    return results
 
-def scoreAnnotationAndConsistency(model_name):
+@check('.xml', cost='expensive', key='memote-score', tool='memote')
+def scoreAnnotationAndConsistency(context):
     description = 'Check the score of the model in SBML format with Memote.'
     print(description)
     memote_score = False
     errors = ''
     try:
-        model = cobra.io.read_sbml_model(model_name + '.xml')
-        _, results = memote.suite.api.test_model(model=model, results=True, exclusive=['test_stoichiometric_consistency', 'test_reaction_mass_balance', 'test_reaction_charge_balance', 'test_find_disconnected', 'test_find_reactions_unbounded_flux_default_condition', 'test_metabolite_annotation_presence', 'test_metabolite_annotation_overview', 'test_metabolite_annotation_wrong_ids', 'test_metabolite_id_namespace_consistency', 'test_reaction_annotation_presence', 'test_reaction_annotation_overview', 'test_reaction_annotation_wrong_ids', 'test_reaction_id_namespace_consistency', 'test_gene_product_annotation_presence', 'test_gene_product_annotation_overview', 'test_gene_product_annotation_wrong_ids', 'test_model_id_presence', 'test_metabolites_presence', 'test_reactions_presence', 'test_genes_presence', 'test_compartments_presence', 'test_metabolic_coverage', 'test_unconserved_metabolites', 'test_inconsistent_min_stoichiometry', 'test_find_unique_metabolites', 'test_find_duplicate_metabolites_in_compartments', 'test_metabolites_charge_presence', 'test_metabolites_formula_presence', 'test_find_medium_metabolites', 'test_find_pure_metabolic_reactions', 'test_find_constrained_pure_metabolic_reactions', 'test_find_transport_reactions', 'test_find_constrained_transport_reactions', 'test_find_candidate_irreversible_reactions', 'test_find_reactions_with_partially_identical_annotations', 'test_find_duplicate_reactions', 'test_find_reactions_with_identical_genes'])
+        # memote may modify the model, keep the shared parse untouched
+        model = context.load('.xml').copy()
+        results = _test_model(model, SHARDS)
         processed_results = memote.suite.api.snapshot_report(results, config=None, html=False)
         results_json = json.loads(processed_results)
         print(results_json['score'])
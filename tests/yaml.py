@@ -1,21 +1,128 @@
 import yamllint
+import yamllint.linter
 from yamllint.config import YamlLintConfig
 import json
+import multiprocessing
+from collections import deque
+from os import environ
+from tests._registry import check
 
-def validate(model_name):
+CONFIG = '{extends: default, rules: {line-length: disable}}'
+# Processes linting chunks of the file, 1 lints the file in one go
+WORKERS = int(environ.get('YAMLLINT_WORKERS', '1'))
+# Lines per chunk when linting in parallel
+CHUNK_LINES = int(environ.get('YAMLLINT_CHUNK_LINES', '50000'))
+# Stop after this many problems, 0 lints the whole file
+MAX_PROBLEMS = int(environ.get('YAMLLINT_MAX_PROBLEMS', '0'))
+# Problems listed in the errors after the problem count
+REPORTED_PROBLEMS = 20
+# Rules about the document as a whole, only meaningful at its real start and end
+START_RULES = {'document-start'}
+END_RULES = {'new-line-at-end-of-file', 'document-end'}
+
+def _chunks(path, chunk_lines):
+    """Split a standard-GEM YAML file into chunks that are documents of their own.
+
+    Chunks start at a top-level list item ("- reactions:") or at an item of
+    such a list ("  - !!omap"). A chunk is preceded by the lines before the
+    first top-level item and, when it starts inside a top-level item, by the
+    first line and the first nested item of that item, so that it is indented
+    and parsed like the same lines in the whole file. Yield the prefix lines,
+    the line number the chunk starts at, the chunk text and whether it is the
+    first and the last chunk.
+    """
+    header = []
+    item = None
+    first_nested = []
+    collecting = False
+    prefix = []
+    body = []
+    start = 1
+    previous = None
+    with open(path, 'r') as file:
+        for number, line in enumerate(file, 1):
+            top = line.startswith('- ')
+            nested = line.startswith('  - ')
+            if top:
+                first_nested = []
+            elif nested:
+                collecting = not first_nested
+            if (top or nested) and item is not None and len(body) >= chunk_lines:
+                if previous:
+                    yield previous + (False,)
+                previous = (prefix, start, ''.join(body), start == 1)
+                prefix = header if top else header + [item] + first_nested
+                body = []
+                start = number
+            if top:
+                item = line
+                collecting = False
+            elif item is None:
+                header.append(line)
+            elif collecting:
+                first_nested.append(line)
+            body.append(line)
+    if previous:
+        yield previous + (False,)
+    yield (prefix, start, ''.join(body), start == 1, True)
+
+def _lint_chunk(chunk):
+    """Lint one chunk and return its problems with line numbers of the file."""
+    prefix, start, text, first, last = chunk
+    conf = YamlLintConfig(CONFIG)
+    problems = []
+    for problem in yamllint.linter.run(''.join(prefix) + text, conf):
+        # the prefix lines are linted as part of the chunk they belong to
+        if problem.line <= len(prefix):
+            continue
+        if (not first and problem.rule in START_RULES) or (not last and problem.rule in END_RULES):
+            continue
+        line = start + problem.line - len(prefix) - 1
+        problems.append(f'{line}:{problem.column}: {problem.message}')
+    return problems
+
+def _problems(path, workers=1, chunk_lines=CHUNK_LINES):
+    """Yield the yamllint problems of the file in line order.
+
+    With more than one worker the file is linted in chunks by a pool of
+    processes, with a bounded number of chunks in flight.
+    """
+    if workers <= 1:
+        conf = YamlLintConfig(CONFIG)
+        with open(path, 'r') as file:
+            for problem in yamllint.linter.run(file, conf):
+                yield str(problem)
+        return
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pending = deque()
+        for chunk in _chunks(path, chunk_lines):
+            pending.append(pool.apply_async(_lint_chunk, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+@check('.yml', cost='expensive', key='yamllint', tool='yamllint')
+def validate(context):
     description = 'Check if the model in YAML format is formatted correctly.'
     print(description)
     is_valid = False
     errors = ''
     try:
-        conf = YamlLintConfig('{extends: default, rules: {line-length: disable}}')
-        with open(model_name + '.yml', 'r') as file:
-            errors = list(map(str, yamllint.linter.run(file, conf)))
-        if len(errors) == 0:
+        count = 0
+        problems = []
+        for problem in _problems(context.path('.yml'), WORKERS):
+            count += 1
+            if len(problems) < REPORTED_PROBLEMS:
+                problems.append(problem)
+            if count == MAX_PROBLEMS:
+                break
+        if count == 0:
             is_valid = True
         else:
-            errors = json.dumps(errors)
+            summary = f'stopped after {count} problems' if count == MAX_PROBLEMS else f'{count} problems'
+            errors = json.dumps([summary] + problems)
     except Exception as e:
         errors = json.dumps(str(e))
         print(e)
-    return 'yamllint', description, yamllint.__version__, is_valid, errors
\ No newline at end of file
+    return 'yamllint', description, yamllint.__version__, is_valid, errors